@@ -0,0 +1,51 @@
+import inspect
+import os
+
+import yaml
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _passthrough(function):
+    return function
+
+
+def load_block(relative_path: str, function_name: str):
+    """
+    Load a block function from its file outside of Mage.
+
+    The Mage decorators are pre-seeded as pass-throughs, so the
+    `if 'transformer' not in globals()` guards in the block skip the mage_ai
+    imports and the decorated function is returned unchanged.
+    """
+    path = os.path.join(PROJECT_DIR, relative_path)
+    namespace = {
+        '__name__': f'block_{function_name}',
+        '__file__': path,
+        'transformer': _passthrough,
+        'data_loader': _passthrough,
+        'data_exporter': _passthrough,
+        'test': _passthrough,
+    }
+    with open(path) as f:
+        exec(compile(f.read(), path, 'exec'), namespace)
+    return namespace[function_name]
+
+
+def block_configuration(pipeline_uuid: str, block_uuid: str) -> dict:
+    """The `configuration` of a block in a pipeline's metadata.yaml."""
+    path = os.path.join(PROJECT_DIR, 'pipelines', pipeline_uuid, 'metadata.yaml')
+    with open(path) as f:
+        metadata = yaml.safe_load(f)
+    for block in metadata['blocks']:
+        if block['uuid'] == block_uuid:
+            return dict(block.get('configuration') or {})
+    raise KeyError(f"Block {block_uuid} not found in pipeline {pipeline_uuid}")
+
+
+def call_block(function, *inputs, **kwargs):
+    """Call a block function the way Mage does, passing kwargs only if accepted."""
+    parameters = inspect.signature(function).parameters.values()
+    if any(p.kind == inspect.Parameter.VAR_KEYWORD for p in parameters):
+        return function(*inputs, **kwargs)
+    return function(*inputs)
@@ -0,0 +1,148 @@
+"""
+Check that every installed kernel backend matches the NumPy kernels.
+
+Run from the directory that contains the nexus project, e.g.
+
+    python -m nexus.benchmarks.conformance --tickers 50 --days 1500
+
+Each kernel runs on every ticker of a synthetic panel, with a few prices
+knocked out to NaN, and its outputs are compared with the NumPy backend:
+same NaN positions and values within the kernel's tolerance. forward_std is
+also checked against np.std on a series whose price level grows a
+hundredfold. The exit status is non-zero if any backend fails, so this can
+gate a worker machine's `backend` setting. Time the passing backends with
+`nexus.benchmarks.run --backends ...`.
+"""
+import argparse
+import sys
+
+import numpy as np
+
+from nexus.benchmarks.synthetic import synthetic_panel
+from nexus.utils.forward_windows import group_bounds, horizon_days
+from nexus.utils.kernels import available_backends, get_backend
+from nexus.utils.sharding import run_grouped
+
+BARRIERS = [0.55, 0.75, 0.75, 0.85]
+HORIZONS = horizon_days([3, 6, 9, 12, 15, 18, 24], 252)
+
+# Largest relative difference accepted per kernel. Counts and shares must be
+# exact; the std kernels may sum in a different order.
+TOLERANCES = {
+    'barrier_metrics': 1e-12,
+    'forward_std': 1e-8,
+    'forward_weights': 0.0,
+}
+
+
+def kernel_outputs(backend, prices, starts, stops) -> dict:
+    pct_above, pct_below, mean_below = run_grouped(
+        backend.barrier_metrics, prices, starts, stops,
+        output_shapes=[(len(HORIZONS),), (len(HORIZONS), len(BARRIERS)), (len(HORIZONS), len(BARRIERS))],
+        args=(BARRIERS, HORIZONS),
+    )
+    (std,) = run_grouped(
+        backend.forward_std, prices, starts, stops,
+        output_shapes=[(len(HORIZONS),)], args=(HORIZONS, 3),
+    )
+    remaining = np.concatenate([np.arange(stop - start, 0, -1) for start, stop in zip(starts, stops)])
+    return {
+        'barrier_metrics': [pct_above, pct_below, mean_below],
+        'forward_std': [std],
+        'forward_weights': [backend.forward_weights(remaining, HORIZONS)],
+    }
+
+
+def max_relative_difference(expected: np.ndarray, actual: np.ndarray) -> float:
+    """Largest |actual - expected| / |expected|; inf if the NaN positions differ."""
+    if not np.array_equal(np.isnan(expected), np.isnan(actual)):
+        return np.inf
+    valid = ~np.isnan(expected)
+    diff = np.abs(actual[valid] - expected[valid])
+    scale = np.abs(expected[valid])
+    with np.errstate(invalid='ignore', divide='ignore'):
+        relative = np.where(scale > 0, diff / scale, diff)
+    return float(relative.max()) if relative.size else 0.0
+
+
+def check_backends(backends=None, n_tickers: int = 20, n_days: int = 1500, seed: int = 0) -> dict:
+    """
+    Compare each backend with NumPy on a synthetic panel.
+
+    Returns {backend: {kernel: max relative difference}} and prints one line
+    per backend and kernel.
+    """
+    df = synthetic_panel(n_tickers, n_days, seed=seed)
+    prices = df['adj_close'].to_numpy(dtype=np.float64).copy()
+    rng = np.random.default_rng(seed)
+    prices[rng.choice(len(prices), size=max(1, len(prices) // 1000), replace=False)] = np.nan
+    starts, stops = group_bounds(df['ticker'].to_numpy())
+
+    expected = kernel_outputs(get_backend('numpy'), prices, starts, stops)
+    report = {}
+    for name in backends or available_backends():
+        actual = kernel_outputs(get_backend(name, fallback=False), prices, starts, stops)
+        report[name] = {}
+        for kernel, tolerance in TOLERANCES.items():
+            difference = max(
+                max_relative_difference(e, a) for e, a in zip(expected[kernel], actual[kernel])
+            )
+            report[name][kernel] = difference
+            status = 'ok' if difference <= tolerance else 'FAIL'
+            print(f"{name:<8} {kernel:<16} max rel diff {difference:.3g} (tolerance {tolerance:g}) {status}")
+    return report
+
+
+def two_pass_std(values: np.ndarray, windows, min_count: int = 3) -> np.ndarray:
+    """forward_std by np.std over every window, as a reference."""
+    n = len(values)
+    out = np.full((len(windows), n), np.nan)
+    for k, window in enumerate(windows):
+        for i in range(n):
+            forward = values[i:min(n, i + window)]
+            if len(forward) >= min_count:
+                out[k, i] = np.std(forward, ddof=1)
+    return out
+
+
+def check_std_accuracy(backends=None, n_days: int = 3000, seed: int = 0) -> dict:
+    """
+    Compare each backend's forward_std with np.std on a series whose price
+    level grows from 20 to 2000 with 1% noise, where a single series-wide
+    centring loses most of its digits. Returns {backend: max relative difference}.
+    """
+    rng = np.random.default_rng(seed)
+    values = np.exp(np.linspace(np.log(20), np.log(2000), n_days) + rng.normal(0, 0.01, n_days))
+    values[rng.choice(n_days, size=2, replace=False)] = np.nan
+    expected = two_pass_std(values, HORIZONS)
+    report = {}
+    tolerance = TOLERANCES['forward_std']
+    for name in backends or available_backends():
+        actual = get_backend(name, fallback=False).forward_std(values, HORIZONS, 3)
+        report[name] = max_relative_difference(expected, actual)
+        status = 'ok' if report[name] <= tolerance else 'FAIL'
+        print(f"{name:<8} {'forward_std':<16} max rel diff vs np.std, level x100 {report[name]:.3g} "
+              f"(tolerance {tolerance:g}) {status}")
+    return report
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--backends', nargs='+', default=None, help='default: every installed backend')
+    parser.add_argument('--tickers', type=int, default=20)
+    parser.add_argument('--days', type=int, default=1500)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    report = check_backends(args.backends, args.tickers, args.days, args.seed)
+    failed = [
+        name for name, differences in report.items()
+        if any(differences[kernel] > tolerance for kernel, tolerance in TOLERANCES.items())
+    ]
+    accuracy = check_std_accuracy(args.backends, seed=args.seed)
+    failed += [name for name, difference in accuracy.items() if difference > TOLERANCES['forward_std']]
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,127 @@
+"""
+Benchmark and check the chunked export path with a local directory sink.
+
+Run from the directory that contains the nexus project, e.g.
+
+    python -m nexus.benchmarks.export --tickers 500 --days 750 --chunk-mb 4
+
+A synthetic panel is exported once as a single Parquet file converted in
+one piece, as a whole-frame export does, and once through export_chunked
+with `local_sink_dir`, as the exporter blocks do with export_mode: chunked.
+Each runs in a fresh process and reports wall time and peak RSS. The
+chunked table is then read back and compared with the panel, and an export
+that fails partway is checked to leave the existing table untouched. The
+exit status is non-zero if either check fails.
+"""
+import argparse
+import concurrent.futures
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from nexus.benchmarks.run import peak_rss_mb
+from nexus.benchmarks.synthetic import synthetic_panel
+from nexus.utils.export_sinks import LocalDirectorySink, export_chunked, export_in_chunks
+
+TABLE_ID = 'prices'
+
+
+class FailingSink(LocalDirectorySink):
+    """LocalDirectorySink whose `write` raises at chunk `fail_at`, like a failed load job."""
+
+    def __init__(self, root: str, fail_at: int):
+        super().__init__(root)
+        self.fail_at = fail_at
+        self.failed = False
+
+    def write(self, table_id: str, index: int, path: str) -> None:
+        if index == self.fail_at:
+            self.failed = True
+            raise RuntimeError(f"Simulated failure loading chunk {index}")
+        super().write(table_id, index, path)
+
+
+def read_table(root: str) -> pd.DataFrame:
+    return pq.read_table(os.path.join(root, TABLE_ID)).to_pandas()
+
+
+def run_mode(mode: str, n_tickers: int, n_days: int, chunk_mb: int, root: str) -> dict:
+    df = synthetic_panel(n_tickers, n_days)
+    baseline_rss = peak_rss_mb()
+    start = time.perf_counter()
+    if mode == 'single':
+        os.makedirs(os.path.join(root, TABLE_ID), exist_ok=True)
+        pq.write_table(pa.Table.from_pandas(df, preserve_index=False), os.path.join(root, TABLE_ID, 'part-00000.parquet'))
+        chunks = 1
+    else:
+        chunks = export_chunked(df, TABLE_ID, {'local_sink_dir': root, 'chunk_mb': chunk_mb}, bigquery_client=None)
+    return {
+        'mode': mode,
+        'rows': len(df),
+        'chunks': chunks,
+        'wall_seconds': round(time.perf_counter() - start, 3),
+        'baseline_rss_mb': round(baseline_rss, 1),
+        'peak_rss_mb': round(peak_rss_mb(), 1),
+    }
+
+
+def check_round_trip(root: str, n_tickers: int, n_days: int) -> bool:
+    expected = synthetic_panel(n_tickers, n_days)
+    return read_table(root).equals(expected)
+
+
+def check_failed_export(n_tickers: int, chunks: int = 5, fail_at: int = 2) -> bool:
+    """A replace that fails at chunk `fail_at` of `chunks` keeps the previous table."""
+    with tempfile.TemporaryDirectory() as root:
+        previous = synthetic_panel(3, 50)
+        export_in_chunks(previous, TABLE_ID, LocalDirectorySink(root))
+        df = synthetic_panel(n_tickers, 500)
+        sink = FailingSink(root, fail_at=fail_at)
+        try:
+            export_in_chunks(df, TABLE_ID, sink, chunk_rows=-(-len(df) // chunks))
+        except RuntimeError:
+            pass
+        # The check means nothing unless the injected failure fired
+        if not sink.failed:
+            raise RuntimeError(f"Export of {chunks} chunks never reached chunk {fail_at}")
+        return read_table(root).equals(previous) and os.listdir(root) == [TABLE_ID]
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--tickers', type=int, default=500)
+    parser.add_argument('--days', type=int, default=750)
+    parser.add_argument('--chunk-mb', type=int, default=4)
+    args = parser.parse_args(argv)
+
+    context = multiprocessing.get_context('spawn')
+    ok = True
+    for mode in ('single', 'chunked'):
+        with tempfile.TemporaryDirectory() as root:
+            # A fresh process per mode keeps peak RSS attributable to it
+            with concurrent.futures.ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+                result = executor.submit(run_mode, mode, args.tickers, args.days, args.chunk_mb, root).result()
+            print(
+                f"{mode:<8} {result['rows']} rows in {result['chunks']} chunks: "
+                f"{result['wall_seconds']:.3f}s wall, {result['peak_rss_mb']:.1f} MiB peak RSS "
+                f"({result['baseline_rss_mb']:.1f} before)"
+            )
+            if mode == 'chunked':
+                round_trip = check_round_trip(root, args.tickers, args.days)
+                print(f"round trip {'ok' if round_trip else 'FAIL'}")
+                ok &= round_trip
+
+    failed_export = check_failed_export(args.tickers)
+    print(f"failed export keeps previous table {'ok' if failed_export else 'FAIL'}")
+    ok &= failed_export
+    return 0 if ok else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,100 @@
+"""
+Benchmark page prefetching against a local fake of the Intrinio price API.
+
+Run from the directory that contains the nexus project, e.g.
+
+    python -m nexus.benchmarks.pagination --pages 50 --latency 0.05
+
+The fake serves `--pages` pages of 100 stock prices with `--latency` seconds
+of simulated network time per request. Each page is converted with
+PriceColumns.add_page, as the loader does, plus `--convert` seconds of CPU
+work standing in for heavier processing (e.g. the SDK's model objects). The
+download runs once with requests made one at a time and once through the
+prefetching iterator. With prefetch the wall time approaches
+pages x max(latency, conversion time) instead of their sum.
+"""
+import argparse
+import time
+from datetime import date, timedelta
+from types import SimpleNamespace
+
+from nexus.utils.columnar import PRICE_FIELDS, PriceColumns
+from nexus.utils.pagination import iter_pages
+
+
+class FakePriceApi:
+    """
+    Serves get_security_stock_prices pages of synthetic prices after
+    sleeping `latency` seconds per request, like a remote API would.
+    """
+
+    def __init__(self, pages: int = 50, page_size: int = 100, latency: float = 0.05):
+        self.pages = pages
+        self.page_size = page_size
+        self.latency = latency
+        self.calls = 0
+        first = date(2000, 1, 3)
+        self._prices = [
+            SimpleNamespace(date=first + timedelta(days=i), **{field: 100.0 + i % 17 for field in PRICE_FIELDS})
+            for i in range(pages * page_size)
+        ]
+
+    def get_security_stock_prices(self, identifier, start_date=None, page_size=100, next_page=''):
+        self.calls += 1
+        time.sleep(self.latency)
+        offset = int(next_page or 0)
+        stop = offset + self.page_size
+        return SimpleNamespace(
+            security=SimpleNamespace(id=f'sec_{identifier}', company_id=f'com_{identifier}', ticker=identifier),
+            stock_prices=self._prices[offset:stop],
+            next_page=str(stop) if stop < len(self._prices) else None,
+        )
+
+
+def spin(seconds: float) -> None:
+    # Busy-wait: conversion holds the CPU, unlike the fake network wait
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+def download(api: FakePriceApi, prefetch: bool, convert: float = 0.0) -> PriceColumns:
+    results = PriceColumns()
+
+    def fetch_page(next_page):
+        return api.get_security_stock_prices('FAKE', page_size=api.page_size, next_page=next_page)
+
+    for response in iter_pages(fetch_page, prefetch):
+        results.add_page(response.security, response.stock_prices)
+        spin(convert)
+    return results
+
+
+def run(pages: int = 50, latency: float = 0.05, convert: float = 0.02, repeats: int = 3) -> dict:
+    api = FakePriceApi(pages=pages, latency=latency)
+    timings = {}
+    for prefetch in (False, True):
+        best = None
+        for _ in range(repeats):
+            start = time.perf_counter()
+            rows = len(download(api, prefetch, convert))
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        timings['prefetch' if prefetch else 'sequential'] = best
+        print(f"{'prefetch' if prefetch else 'sequential':<10} {pages} pages, {rows} rows: {best:.3f}s")
+    return timings
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--pages', type=int, default=50)
+    parser.add_argument('--latency', type=float, default=0.05, help='seconds per request')
+    parser.add_argument('--convert', type=float, default=0.02, help='extra CPU seconds per page')
+    parser.add_argument('--repeats', type=int, default=3)
+    args = parser.parse_args(argv)
+
+    run(args.pages, args.latency, args.convert, args.repeats)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,157 @@
+"""
+Benchmark the stock transformers on synthetic panels.
+
+Run from the directory that contains the nexus project, e.g.
+
+    python -m nexus.benchmarks.run --tickers 100 500 --days 750 3750 --seed-series GSPC DJI IXIC
+
+Pass --backends numpy numba polars to time each kernel backend; check them
+first with `python -m nexus.benchmarks.conformance`.
+
+Each (transformer, panel size) case runs in a fresh process with the block
+configuration from the pipeline metadata.yaml, and one JSON line per case is
+appended to the output file so runs can be compared over time.
+"""
+import argparse
+import concurrent.futures
+import contextlib
+import gc
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import subprocess
+import sys
+import time
+import uuid
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+from nexus.benchmarks.blocks import PROJECT_DIR, block_configuration, call_block, load_block
+from nexus.benchmarks.synthetic import SEED_FILES, load_seed_returns, synthetic_panel
+from nexus.utils.kernels import BACKEND_MODULES
+
+# name: (block file, function, pipeline uuid, block uuid, configuration overrides)
+# Incremental and output caches are disabled so every case measures a full computation
+TRANSFORMERS = {
+    'barrier_metrics': (
+        'transformers/barrier_metrics.py', 'calculate_barrier_metrics',
+        'data_stockeod', 'barrier_metrics', {'incremental_path': None, 'output_cache_dir': None},
+    ),
+    'resilient_sword': (
+        'transformers/resilient_sword.py', 'calculate_forward_std_devs_fast',
+        'data_stockeod', 'resilient_sword', {'incremental_path': None, 'output_cache_dir': None},
+    ),
+    # block1 runs on the economics pipeline; on the panel it resets per ticker
+    'block1': (
+        'transformers/block1.py', 'add_forward_weights',
+        'data_economics', 'block1', {'group_by': 'ticker'},
+    ),
+}
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process so far, in MiB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and KiB on Linux
+    return peak / 2**20 if sys.platform == 'darwin' else peak / 2**10
+
+
+def run_case(name: str, n_tickers: int, n_days: int, seed: int, seed_series, backend=None) -> dict:
+    relative_path, function_name, pipeline_uuid, block_uuid, overrides = TRANSFORMERS[name]
+    seed_returns = load_seed_returns(seed_series) if seed_series else None
+    df = synthetic_panel(n_tickers, n_days, seed=seed, seed_returns=seed_returns)
+
+    function = load_block(relative_path, function_name)
+    configuration = {**block_configuration(pipeline_uuid, block_uuid), **overrides}
+    if backend:
+        configuration['backend'] = backend
+
+    gc.collect()
+    baseline_rss = peak_rss_mb()
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        wall_start, cpu_start = time.perf_counter(), time.process_time()
+        output = call_block(function, df, configuration=configuration)
+        wall, cpu = time.perf_counter() - wall_start, time.process_time() - cpu_start
+
+    return {
+        'transformer': name,
+        'backend': configuration.get('backend') or 'numpy',
+        'tickers': n_tickers,
+        'days': n_days,
+        'seed': seed,
+        'seed_series': list(seed_series or []),
+        'rows_in': len(df),
+        'rows_out': len(output),
+        'columns_out': output.shape[1],
+        'wall_seconds': round(wall, 4),
+        'cpu_seconds': round(cpu, 4),
+        'rows_per_second': round(len(df) / wall, 1) if wall > 0 else None,
+        'baseline_rss_mb': round(baseline_rss, 1),
+        'peak_rss_mb': round(peak_rss_mb(), 1),
+    }
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.check_output(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=PROJECT_DIR, stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmarks(transformers, tickers, days, seed=0, seed_series=None, output='benchmark_results.jsonl',
+                   backends=None):
+    run = {
+        'run_id': uuid.uuid4().hex[:12],
+        'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'git_revision': git_revision(),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'machine': platform.machine(),
+        'cpu_count': os.cpu_count(),
+    }
+    cases = [(name, t, d, b) for name in transformers for b in backends or [None] for t in tickers for d in days]
+    results = []
+
+    # A fresh process per case keeps peak RSS attributable to that case
+    context = multiprocessing.get_context('spawn')
+    for name, n_tickers, n_days, backend in cases:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+            result = executor.submit(run_case, name, n_tickers, n_days, seed, seed_series, backend).result()
+        record = {**run, **result}
+        results.append(record)
+        print(
+            f"{name:<16} {result['backend']:<7} {n_tickers:>6} tickers x {n_days:>5} days: "
+            f"{result['wall_seconds']:>9.3f}s wall, {result['peak_rss_mb']:>8.1f} MiB peak RSS"
+        )
+        with open(output, 'a') as f:
+            f.write(json.dumps(record) + '\n')
+
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--transformers', nargs='+', choices=list(TRANSFORMERS), default=list(TRANSFORMERS))
+    parser.add_argument('--tickers', nargs='+', type=int, default=[100])
+    parser.add_argument('--days', nargs='+', type=int, default=[750])
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--seed-series', nargs='*', choices=list(SEED_FILES), default=None,
+                        help='bootstrap returns from these index histories in data/')
+    parser.add_argument('--output', default='benchmark_results.jsonl')
+    parser.add_argument('--backends', nargs='+', choices=list(BACKEND_MODULES), default=None,
+                        help='kernel backends to time; default: the block configuration')
+    args = parser.parse_args(argv)
+
+    run_benchmarks(args.transformers, args.tickers, args.days, args.seed, args.seed_series, args.output,
+                   args.backends)
+
+
+if __name__ == '__main__':
+    main()
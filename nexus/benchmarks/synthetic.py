@@ -0,0 +1,63 @@
+import os
+from typing import List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_DIR = os.path.join(os.path.dirname(PROJECT_DIR), 'data')
+
+# Index histories in data/ usable as seeds for synthetic price paths
+SEED_FILES = {
+    'GSPC': 'GSPC_data.csv',
+    'DJI': 'DJI_data.csv',
+    'IXIC': 'IXIC_data.csv',
+}
+
+
+def load_seed_returns(names: Sequence[str] = tuple(SEED_FILES), data_dir: str = DATA_DIR) -> List[np.ndarray]:
+    """Daily log returns of the real index closes in data/, one array per index."""
+    returns = []
+    for name in names:
+        close = pd.read_csv(os.path.join(data_dir, SEED_FILES[name]), usecols=['Close'])['Close']
+        returns.append(np.diff(np.log(close.dropna().to_numpy())))
+    return returns
+
+
+def synthetic_panel(n_tickers: int, n_days: int, seed: int = 0,
+                    seed_returns: Optional[List[np.ndarray]] = None,
+                    block_size: int = 21, start: str = '2015-01-02') -> pd.DataFrame:
+    """
+    Synthetic (ticker, date, adj_close) panel sorted by ticker, then date.
+
+    Without `seed_returns` every ticker follows a geometric random walk. With
+    it, returns are a block bootstrap of the real index histories (blocks never
+    straddle two indices), scaled per ticker to stock-like volatility, so
+    drawdowns and volatility clustering resemble the market data.
+    """
+    rng = np.random.default_rng(seed)
+
+    if seed_returns is None:
+        returns = rng.normal(0.0003, 0.02, size=(n_tickers, n_days))
+    else:
+        pool = np.concatenate(seed_returns)
+        # Valid block starts inside each index history
+        offsets = np.cumsum([0] + [len(r) for r in seed_returns[:-1]])
+        valid_starts = np.concatenate([
+            offset + np.arange(max(len(r) - block_size, 0) + 1)
+            for offset, r in zip(offsets, seed_returns)
+        ])
+        n_blocks = -(-n_days // block_size)
+        starts = valid_starts[rng.integers(0, len(valid_starts), size=(n_tickers, n_blocks))]
+        index = (starts[:, :, None] + np.arange(block_size)).reshape(n_tickers, -1)[:, :n_days]
+        returns = pool[index] * rng.uniform(1.0, 2.5, size=(n_tickers, 1))
+
+    prices = rng.uniform(10, 500, size=(n_tickers, 1)) * np.exp(np.cumsum(returns, axis=1))
+    tickers = np.array([f'T{i:05d}' for i in range(n_tickers)])
+    dates = pd.bdate_range(start, periods=n_days)
+
+    return pd.DataFrame({
+        'ticker': np.repeat(tickers, n_days),
+        'date': np.tile(dates.values, n_tickers),
+        'adj_close': prices.ravel(),
+    })
@@ -0,0 +1,176 @@
+"""
+Exercise the RequestGovernor against a local HTTP server that throttles.
+
+Run from the directory that contains the nexus project, e.g.
+
+    python -m nexus.benchmarks.throttling --requests 400 --workers 16 --quota 100
+
+The server answers each request after `--latency` seconds, but admits only
+`--quota` requests per second and `--max-concurrent` at once. Anything above
+that gets a 429 (or `--status`, e.g. 503), with a Retry-After header when
+`--retry-after` is set. The same workload runs once with fixed concurrency
+(no adaptation, immediate jittered retries) and once with the adaptive
+governor, and reports wall time, rejections and retries for each.
+
+Before that, a governor on a fake clock is checked to wait out a
+Retry-After of a 429 and of a 503 alike; the exit status is non-zero if it
+does not.
+"""
+import argparse
+import concurrent.futures
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from nexus.utils.rate_limit import RequestGovernor, TokenBucket
+
+
+class ThrottlingServer(ThreadingHTTPServer):
+    """Local server that returns 429 (or `status`) above a request rate or concurrency."""
+
+    daemon_threads = True
+
+    def __init__(self, quota: float, max_concurrent: int, latency: float, retry_after: float = None,
+                 status: int = 429):
+        super().__init__(('127.0.0.1', 0), ThrottlingHandler)
+        self.status = status
+        self.bucket = TokenBucket(quota)
+        self.max_concurrent = max_concurrent
+        self.latency = latency
+        self.retry_after = retry_after
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.served = 0
+        self.rejected = 0
+
+    @property
+    def url(self) -> str:
+        return f'http://127.0.0.1:{self.server_address[1]}/'
+
+
+class ThrottlingHandler(BaseHTTPRequestHandler):
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            admitted = server.in_flight < server.max_concurrent and server.bucket.try_acquire()
+            if admitted:
+                server.in_flight += 1
+            else:
+                server.rejected += 1
+        if not admitted:
+            self.send_response(server.status)
+            if server.retry_after is not None:
+                self.send_header('Retry-After', str(server.retry_after))
+            self.end_headers()
+            return
+        try:
+            time.sleep(server.latency)
+            self.send_response(200)
+            self.end_headers()
+            self.wfile.write(b'ok')
+        finally:
+            with server.lock:
+                server.in_flight -= 1
+                server.served += 1
+
+    def log_message(self, format, *args):
+        pass
+
+
+def fetch(url: str) -> bytes:
+    with urllib.request.urlopen(url) as response:
+        return response.read()
+
+
+def run_workload(url: str, governor: RequestGovernor, n_requests: int, workers: int) -> float:
+    start = time.perf_counter()
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+        for future in [executor.submit(governor.call, fetch, url) for _ in range(n_requests)]:
+            future.result()
+    return time.perf_counter() - start
+
+
+def run(n_requests: int = 400, workers: int = 16, quota: float = 100, max_concurrent: int = 8,
+        latency: float = 0.02, retry_after: float = None, status: int = 429) -> dict:
+    governors = {
+        'fixed': RequestGovernor(initial_limit=workers, min_limit=workers, max_limit=workers,
+                                 base_delay=0.01, max_retries=50),
+        'adaptive': RequestGovernor(initial_limit=min(4, workers), max_limit=workers, cooldown=0.25,
+                                    base_delay=0.05, max_retries=50),
+    }
+    results = {}
+    for name, governor in governors.items():
+        server = ThrottlingServer(quota, max_concurrent, latency, retry_after, status)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            wall = run_workload(server.url, governor, n_requests, workers)
+        finally:
+            server.shutdown()
+            server.server_close()
+        results[name] = {
+            'wall_seconds': round(wall, 3),
+            'requests_per_second': round(n_requests / wall, 1),
+            'rejected': server.rejected,
+            'retries': governor.retries,
+            'final_limit': round(governor.limit, 2),
+        }
+        print(
+            f"{name:<9} {wall:7.3f}s  {n_requests / wall:7.1f} req/s  "
+            f"{server.rejected:>5} x {status}  final limit {governor.limit:.2f}"
+        )
+    return results
+
+
+def retry_after_wait(status: int, retry_after: float = 5.0) -> float:
+    """Seconds a governor on a fake clock waits before retrying a `status` with Retry-After."""
+    now = [0.0]
+
+    def sleep(seconds):
+        now[0] += seconds
+
+    governor = RequestGovernor(clock=lambda: now[0], sleep=sleep, random=lambda: 1.0)
+    attempts = []
+
+    def flaky():
+        attempts.append(now[0])
+        if len(attempts) == 1:
+            raise urllib.error.HTTPError('http://test/', status, 'rejected', {'Retry-After': str(retry_after)}, None)
+        return b'ok'
+
+    governor.call(flaky)
+    return attempts[1] - attempts[0]
+
+
+def check_retry_after(retry_after: float = 5.0) -> bool:
+    ok = True
+    for status in (429, 503):
+        wait = retry_after_wait(status, retry_after)
+        status_ok = wait >= retry_after
+        ok &= status_ok
+        print(f"{status} with Retry-After {retry_after:g}: retried after {wait:g}s {'ok' if status_ok else 'FAIL'}")
+    return ok
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--requests', type=int, default=400)
+    parser.add_argument('--workers', type=int, default=16)
+    parser.add_argument('--quota', type=float, default=100, help='requests per second the server admits')
+    parser.add_argument('--max-concurrent', type=int, default=8)
+    parser.add_argument('--latency', type=float, default=0.02, help='seconds per admitted request')
+    parser.add_argument('--retry-after', type=float, default=None, help='Retry-After seconds sent with rejections')
+    parser.add_argument('--status', type=int, default=429, help='HTTP status of rejections, e.g. 503')
+    args = parser.parse_args(argv)
+
+    ok = check_retry_after()
+    run(args.requests, args.workers, args.quota, args.max_concurrent, args.latency, args.retry_after, args.status)
+    return 0 if ok else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
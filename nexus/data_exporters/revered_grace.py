@@ -3,12 +3,15 @@ from mage_ai.io.bigquery import BigQuery
 from mage_ai.io.config import ConfigFileLoader
 from pandas import DataFrame
 from os import path
+from nexus.utils.export_sinks import export_chunked
+from nexus.utils.instrumentation import instrumented
 
 if 'data_exporter' not in globals():
     from mage_ai.data_preparation.decorators import data_exporter
 
 
 @data_exporter
+@instrumented
 def export_data_to_big_query(df: DataFrame, **kwargs) -> None:
     """
     Template for exporting data to a BigQuery warehouse.
@@ -19,6 +22,16 @@ def export_data_to_big_query(df: DataFrame, **kwargs) -> None:
     table_id = kwargs['bigquery_table_id']
     config_path = path.join(get_repo_path(), 'io_config.yaml')
     config_profile = 'default'
+    config = kwargs.get('configuration') or {}
+
+    if config.get('export_mode') == 'chunked':
+        export_chunked(
+            df,
+            table_id,
+            config,
+            lambda: BigQuery.with_config(ConfigFileLoader(config_path, config_profile)).client,
+        )
+        return
 
     BigQuery.with_config(ConfigFileLoader(config_path, config_profile)).export(
         df,
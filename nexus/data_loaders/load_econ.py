@@ -1,10 +1,15 @@
 import io
+import os
+import concurrent.futures
 from fredapi import Fred
 import requests
 from mage_ai.data_preparation.shared.secrets import get_secret_value
 import pandas as pd
-from fredapi import Fred
 import numpy as np
+from nexus.utils.asof import Release, align_asof, business_calendar
+from nexus.utils.cache import ParquetCache
+from nexus.utils.instrumentation import Progress, emit, instrumented, phase, record, submit
+from nexus.utils.rate_limit import RequestGovernor, count_requests, make_governor
 
 if 'data_loader' not in globals():
     from mage_ai.data_preparation.decorators import data_loader
@@ -35,47 +40,156 @@ FRB_INDICES_MAPPING = {
 }
 
 
-def download_fred_data(series_codes: list, api_key: str = FRB_API_KEY, start_date: str = "2010-01-01") -> pd.DataFrame:
-    """Download multiple FRED series and return as DataFrame."""
-    fred = Fred(api_key=api_key)
-    data_dict = {}
-    
-    for code in series_codes:
-        try:
-            print(f"Downloading {code}")
-            series = fred.get_series(code)
-            filtered_series = series[series.index >= start_date]
-            data_dict[code] = filtered_series
-        except Exception as e:
-            print(f"Error downloading {code}: {e}")
-    
-    if data_dict:
-        df = pd.concat(data_dict, axis=1)
-        df.reset_index(inplace=True)
-        df.rename(columns={'index': 'DATE'}, inplace=True)
-        return df
+# Release frequency and publication lag (calendar days after the period
+# ends) of each series, for point-in-time alignment. H.15 rates and spreads
+# are posted the next day; the S&P 500 close is known the same day.
+RELEASES = {
+    **{code: Release('D', 1) for code in FRB_RATES},
+    'CPIAUCSL': Release('M', 13),
+    'PCUOMFGOMFG': Release('M', 14),
+    'UNRATE': Release('M', 7),
+    'CIVPART': Release('M', 7),
+    'INDPRO': Release('M', 16),
+    'DFF': Release('D', 1),
+    'T10Y3M': Release('D', 1),
+    'T10Y2Y': Release('D', 1),
+    'DAAA': Release('D', 1),
+    'SP500': Release('D', 0),
+}
+
+
+# Offline copies of FRED indices that are not stored as rate_/series_ CSVs
+OFFLINE_INDEX_FILES = {
+    'SP500': 'GSPC_data.csv',
+    'DJIA': 'DJI_data.csv',
+    'NASDAQCOM': 'IXIC_data.csv',
+}
+
+
+def load_offline_series(code: str, data_dir: str, start_date: str = "2010-01-01") -> pd.Series:
+    """Read a series from the CSVs in data/ (rate_*.csv, series_*.csv, index files)."""
+    if code in OFFLINE_INDEX_FILES:
+        df = pd.read_csv(os.path.join(data_dir, OFFLINE_INDEX_FILES[code]), index_col='Date', parse_dates=True)
+        series = df['Close']
     else:
-        return pd.DataFrame()
+        paths = [os.path.join(data_dir, f'{prefix}_{code}.csv') for prefix in ('rate', 'series')]
+        path = next((p for p in paths if os.path.exists(p)), None)
+        if path is None:
+            raise FileNotFoundError(f"No offline CSV for {code} in {data_dir}")
+        series = pd.read_csv(path, index_col=0, parse_dates=True).iloc[:, 0]
+    series = series[series.index >= start_date]
+    series.index.name = None
+    series.name = None
+    return series
 
 
-def rename_columns(df: pd.DataFrame) -> pd.DataFrame:
-    """Rename columns to match desired output format."""
-    # Rename rate columns (convert to lowercase for some)
-    rate_renames = {
-        'DGS3MO': 'DGS3mo',
-        'DGS6MO': 'DGS6mo'
-    }
-    
-    # Combine all rename mappings
-    all_renames = {**rate_renames, **FRB_SERIES_MAPPING, **FRB_INDICES_MAPPING}
-    
-    return df.rename(columns=all_renames)
+def fetch_series(fred: Fred, code: str, start_date: str, cache: ParquetCache = None,
+                 governor: RequestGovernor = None) -> pd.Series:
+    """
+    Download one FRED series from `start_date` on, filtered on the server.
+
+    With a cache, the series' last observation date is looked up first and a
+    cached copy for the same (code, start date, last observation) is reused,
+    so unchanged monthly series are not downloaded again on daily runs.
+    Requests go through `governor`, which retries throttled calls.
+    """
+    governor = governor or make_governor()
+    key = None
+    if cache is not None:
+        last_observation = governor.call(fred.get_series_info, code)['observation_end']
+        key = f'{code}_{start_date}_{last_observation}'
+        cached = cache.get(key)
+        if cached is not None:
+            return cached[code].rename(None)
+
+    series = governor.call(fred.get_series, code, observation_start=start_date)
+    if key is not None:
+        cache.put(key, series.to_frame(code))
+    return series
+
+
+def fetch_fred_series(series_codes: list, api_key: str = FRB_API_KEY, start_date: str = "2010-01-01",
+                      max_workers: int = 8, cache: ParquetCache = None, offline_dir: str = None,
+                      requests_per_second: float = None) -> dict:
+    """
+    Fetch all `series_codes` concurrently and return {code: pd.Series}.
+
+    With `offline_dir` the series are read from local CSVs instead of FRED.
+    Requests share one RequestGovernor that adapts concurrency (up to
+    `max_workers`) to FRED's throttling and, with `requests_per_second`, caps
+    the request rate. Series that fail to download are reported and left out.
+    """
+    governor = None
+    if offline_dir:
+        fetch = lambda code: load_offline_series(code, offline_dir, start_date)
+    else:
+        fred = Fred(api_key=api_key)
+        governor = make_governor(max_workers, requests_per_second)
+        fetch = lambda code: fetch_series(fred, code, start_date, cache, governor)
+
+    data_dict = {}
+    progress = Progress('series', total=len(series_codes))
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {code: submit(executor, fetch, code) for code in series_codes}
+        for code, future in futures.items():
+            try:
+                data_dict[code] = future.result()
+            except Exception as e:
+                emit('api_error', call='Fred->get_series', code=code, error=str(e))
+            progress.update()
+
+    if governor is not None:
+        count_requests(governor)
+    return data_dict
+
+
+# Output column names: rates keep their codes (with lowercase month suffixes),
+# economic series and indices use their short names
+COLUMN_RENAMES = {
+    'DGS3MO': 'DGS3mo',
+    'DGS6MO': 'DGS6mo',
+    **FRB_SERIES_MAPPING,
+    **FRB_INDICES_MAPPING,
+}
+
+
+def align_series(series_data: dict) -> pd.DataFrame:
+    """
+    Align all series on the sorted union of their dates in a single concat.
+
+    Columns are renamed to the output format on the way in and the frame is
+    indexed by DATE.
+    """
+    columns = {COLUMN_RENAMES.get(code, code): series for code, series in series_data.items()}
+    df = pd.concat(columns, axis=1, sort=True)
+    df.index.name = 'DATE'
+    return df
+
+
+def align_series_asof(series_data: dict, start_date: str, holidays: list = None,
+                      lags: dict = None) -> pd.DataFrame:
+    """
+    Align all series on a business-day calendar as of each day.
+
+    The calendar runs from `start_date` to the last observation, without
+    `holidays`. Each day holds every series' latest value published by then
+    (see RELEASES; `lags` overrides publication lags by series code), so
+    monthly releases appear on their publication day rather than on the
+    first of the month, and no other dates are added. Columns are renamed
+    and the frame is indexed by DATE, like align_series.
+    """
+    releases = dict(RELEASES)
+    for code, lag_days in (lags or {}).items():
+        releases[code] = releases.get(code, Release('D'))._replace(lag_days=lag_days)
+    end = max(series.index.max() for series in series_data.values())
+    calendar = business_calendar(start_date, end, holidays)
+    df = align_asof(series_data, calendar, releases).rename(columns=COLUMN_RENAMES)
+    df.index.name = 'DATE'
+    return df
 
 
 def calculate_derived_variables(df: pd.DataFrame) -> pd.DataFrame:
-    """Calculate derived/interpolated variables."""
-    df = df.copy()
-    
+    """Calculate derived/interpolated variables in place."""
     # Convert DGS values from percentages to decimals
     dgs_cols = ['DGS10', 'DGS2', 'DGS3', 'DGS1', 'DGS3mo', 'DGS6mo']
     for col in dgs_cols:
@@ -83,7 +197,7 @@ def calculate_derived_variables(df: pd.DataFrame) -> pd.DataFrame:
             df[col] = df[col] / 100
     
     # Forward fill S&P 500 data
-    df['snp500'] = df['snp500'].fillna(method='ffill')
+    df['snp500'] = df['snp500'].ffill()
     
     # Interpolated rates (now in decimal form)
     df['dgs1p5'] = (df['DGS1'] + df['DGS2']) / 2  # 1.5-Year Rate
@@ -97,42 +211,46 @@ def calculate_derived_variables(df: pd.DataFrame) -> pd.DataFrame:
     return df
 
 @data_loader
-def main() -> pd.DataFrame:
+@instrumented
+def main(*args, **kwargs) -> pd.DataFrame:
     """Download and process all financial data."""
-    print("Downloading FRB rates...")
-    rates_df = download_fred_data(FRB_RATES)
+    config = kwargs.get('configuration') or {}
+    start_date = config.get('start_date') or "2010-01-01"
+    cache = ParquetCache(config['fred_cache_dir']) if config.get('fred_cache_dir') else None
     
-    print("\nDownloading FRB economic series...")
-    series_df = download_fred_data(list(FRB_SERIES_MAPPING.keys()))
+    # Fetch every series (FRB rates, economic series and indices) in one concurrent batch
+    with phase('download'):
+        series_data = fetch_fred_series(
+            FRB_RATES + list(FRB_SERIES_MAPPING.keys()) + list(FRB_INDICES_MAPPING.keys()),
+            start_date=start_date,
+            max_workers=config.get('max_workers', 8),
+            cache=cache,
+            offline_dir=config.get('offline_data_dir'),
+            requests_per_second=config.get('requests_per_second'),
+        )
+        record(series=len(series_data))
     
-    print("\nDownloading indices...")
-    indices_df = download_fred_data(list(FRB_INDICES_MAPPING.keys()))
-    
-    # Merge all dataframes
-    print("\nMerging data...")
-    dataframes = [df for df in [rates_df, series_df, indices_df] if not df.empty]
-    
-    if not dataframes:
-        print("No data downloaded")
+    if not series_data:
         return pd.DataFrame()
     
-    # Start with first dataframe and merge others
-    merged = dataframes[0].copy()
-    for df in dataframes[1:]:
-        merged = pd.merge(merged, df, on='DATE', how='outer')
-    
-    # Rename columns to match desired format
-    merged = rename_columns(merged)
+    # One date-aligned frame for rates, series and indices
+    alignment = config.get('alignment', 'outer')
+    if alignment not in ('outer', 'asof'):
+        raise ValueError(f"Unknown alignment: {alignment}")
+    with phase('align', alignment=alignment):
+        if alignment == 'asof':
+            # Point-in-time values on a business-day calendar
+            merged = align_series_asof(
+                series_data, start_date, config.get('calendar_holidays'), config.get('publication_lags'),
+            )
+        else:
+            merged = align_series(series_data)
     
     # Calculate derived variables
-    print("Calculating derived variables...")
-    merged = calculate_derived_variables(merged)
-    
-    # Sort by date
-    merged.sort_values('DATE', inplace=True)
-    merged.reset_index(drop=True, inplace=True)
+    with phase('derive'):
+        calculate_derived_variables(merged)
     
-    print(f"\nDownload complete! Dataset shape: {merged.shape}")
-    print(f"Date range: {merged['DATE'].min()} to {merged['DATE'].max()}")
+    merged.reset_index(inplace=True)
+    record(columns=merged.shape[1], first_date=merged['DATE'].min(), last_date=merged['DATE'].max())
     
     return merged
@@ -7,8 +7,14 @@ from intrinio_sdk.rest import ApiException
 from datetime import datetime
 from dateutil.relativedelta import relativedelta
 import concurrent.futures
-from tqdm import tqdm
 from mage_ai.data_preparation.shared.secrets import get_secret_value
+from nexus.utils.cache import ParquetCache
+from nexus.utils.columnar import PriceColumns
+from nexus.utils.frame_store import store_frame
+from nexus.utils.instrumentation import Progress, count, emit, instrumented, phase, record, submit
+from nexus.utils.pagination import iter_pages
+from nexus.utils.price_store import PriceStore
+from nexus.utils.rate_limit import count_requests, make_governor
 
 if 'data_loader' not in globals():
     from mage_ai.data_preparation.decorators import data_loader
@@ -20,31 +26,66 @@ if 'test' not in globals():
 API_KEY = get_secret_value('Intrinio_API')
 
 today = datetime.now()
-five_years_ago = (today - relativedelta(years=3)).strftime("%Y-%m-%d")
-results_dictionary = {}
+# Start of the price history kept for every ticker (three years)
+history_start = (today - relativedelta(years=3)).strftime("%Y-%m-%d")
 
 intrinio.ApiClient().set_api_key(API_KEY) 
-intrinio.ApiClient().allow_retries(True)
+# Throttling is retried by the RequestGovernor, which also adapts concurrency
+intrinio.ApiClient().allow_retries(False)
 
-def get_universe():
-    date = '2025-05-14'  # Yesterday's date
-    page_size = 100
-    start_time = datetime.now()
+UNIVERSE_COLUMNS = ['ticker', 'name', 'date', 'marketcap']
 
+
+def get_universe(as_of=None, cache=None, page_size=100, prefetch=False, company_api=None, governor=None):
+    """
+    Companies with a market cap above $2B on `as_of` (default: the previous
+    business day).
+
+    The full daily-metrics snapshot (ticker, name, date, marketcap) is read
+    from `cache`, a ParquetCache keyed by as-of date, when a fresh entry
+    exists, so repeat runs and backfills skip the paginated crawl. On a miss
+    the pages are fetched with `page_size`; with `prefetch` the next page is
+    requested while the current one is being processed. Only complete
+    snapshots are cached. Requests go through `governor`, a RequestGovernor.
+    """
+    date = as_of or (pd.Timestamp(today) - pd.offsets.BDay(1)).strftime("%Y-%m-%d")
+    cache_key = f'universe_{date}'
+
+    universe = cache.get(cache_key) if cache is not None else None
+    cached = universe is not None
+    if not cached:
+        universe, complete = fetch_universe(date, page_size, prefetch, company_api, governor)
+        if cache is not None and complete:
+            cache.put(cache_key, universe)
+    record(universe_date=date, universe_cached=cached, marketcap_entries=len(universe))
+
+    selected_universe = universe[((universe.marketcap>2000000000) & (universe.ticker.notna()))]
+    
+    return selected_universe
+
+
+def fetch_universe(date, page_size=100, prefetch=False, company_api=None, governor=None):
     # Get Marketcap data with pagination
+    # Returns the snapshot and whether every page was retrieved
+    company_api = company_api or intrinio.CompanyApi()
+    governor = governor or make_governor()
     marketcap_data = []
-    next_page = ''
+    complete = False
+    progress = Progress('marketcap pages')
+
+    def fetch_page(next_page):
+        return governor.call(
+            company_api.get_all_companies_daily_metrics,
+            on_date=date, 
+            page_size=page_size,
+            next_page=next_page
+        )
+
+    try:
+        # With prefetch the next request is in flight while this page is processed
+        for response in iter_pages(fetch_page, prefetch):
+            progress.update(entries=len(marketcap_data) + len(response.daily_metrics))
 
-    while True:
-        try:
-            response = intrinio.CompanyApi().get_all_companies_daily_metrics(
-                on_date=date, 
-                page_size=page_size,
-                next_page=next_page
-            )
-            
-            print(f'Processing {len(response.daily_metrics)} marketcap entries...')
-            
             # Process current page of results
             for daily_metric in response.daily_metrics:
                 ticker = daily_metric.company.ticker
@@ -58,98 +99,274 @@ def get_universe():
                 }
                 
                 marketcap_data.append(data)
-            
-            # Check if there are more pages
-            next_page = response.next_page
-            if not next_page:
-                break
-                
-        except ApiException as e:
-            print(f"Exception when calling CompanyApi->get_all_companies_daily_metrics: {e}")
-            break
+        complete = True
+    except ApiException as e:
+        emit('api_error', call='CompanyApi->get_all_companies_daily_metrics', date=date, error=str(e))
 
-    print(f'Found {len(marketcap_data)} marketcap entries for: {date}')
-    print(f'Time elapsed: {datetime.now() - start_time}')
+    return pd.DataFrame(marketcap_data, columns=UNIVERSE_COLUMNS), complete
 
-    universe = pd.DataFrame(list(marketcap_data))
-    selected_universe = universe[((universe.marketcap>2000000000) & (universe.ticker.notna()))]
-    
-    return selected_universe
-
-def work(ticker):
+def work(ticker, security_api=None, governor=None, start_date=None, prefetch=False):
     # Get EOD Stock Prices with pagination
     # https://docs.intrinio.com/documentation/python/get_security_stock_prices_v2
+    # Returns this ticker's rows as PriceColumns so that workers never share
+    # mutable state, and whether every page was retrieved; callers merge the
+    # complete results. Pages run newest first, so a partial result would
+    # leave a gap before its oldest row. With prefetch the next page is
+    # requested while the current one is converted. Requests go through
+    # `governor`, which is shared by all workers.
     identifier = ticker
-    start_date = five_years_ago
+    start_date = start_date or history_start
     page_size = 100  # Maximum allowed page size
-    total_prices = 0
+    results = PriceColumns()
+    complete = False
+    security_api = security_api or intrinio.SecurityApi()
+    governor = governor or make_governor()
+    
+    def fetch_page(next_page):
+        return governor.call(
+            security_api.get_security_stock_prices,
+            identifier, 
+            start_date=start_date, 
+            page_size=page_size, 
+            next_page=next_page
+        )
     
     try:
-        # Initialize pagination
-        next_page = ''
-        
-        while True:
-            # Get the current page of results
-            response = intrinio.SecurityApi().get_security_stock_prices(
-                identifier, 
-                start_date=start_date, 
-                page_size=page_size, 
+        for response in iter_pages(fetch_page, prefetch):
+            # Append the page straight into typed column buffers
+            results.add_page(response.security, response.stock_prices)
+        complete = True
+
+    except ApiException as e:
+        emit('api_error', call='SecurityApi->get_security_stock_prices', ticker=ticker, error=str(e))
+
+    return results, complete
+
+
+def download_prices(tickers, max_workers=1, requests_per_second=None, security_api=None, start_dates=None,
+                    prefetch=False):
+    """
+    Download EOD prices for `tickers`, optionally with a pool of worker threads.
+
+    At most `max_workers` tickers are in flight at once. Every page request
+    goes through one RequestGovernor, which adapts the number of concurrent
+    requests to the API's 429s, retries with backoff and, when
+    `requests_per_second` is set, draws from a single token bucket.
+    `security_api` replaces intrinio.SecurityApi, e.g. with a local fake.
+    `start_dates` optionally maps tickers to their own start date. With
+    `prefetch` each ticker keeps its next page request in flight while the
+    current page is converted. Per-ticker results are merged in ticker order;
+    tickers whose download failed partway are left out entirely, so they
+    have no rows rather than only their newest pages.
+    """
+    governor = make_governor(max_workers, requests_per_second)
+    start_dates = start_dates or {}
+    prices = PriceColumns()
+    progress = Progress('tickers', total=len(tickers))
+
+    def merge(result):
+        results, complete = result
+        if complete:
+            prices.extend(results)
+        else:
+            count('failed_tickers')
+
+    if max_workers <= 1:
+        for ticker in tickers:
+            merge(work(ticker, security_api, governor, start_dates.get(ticker), prefetch))
+            progress.update()
+        count_requests(governor)
+        return prices
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [
+            submit(executor, work, ticker, security_api, governor, start_dates.get(ticker), prefetch)
+            for ticker in tickers
+        ]
+        for _ in concurrent.futures.as_completed(futures):
+            progress.update()
+    count_requests(governor)
+    record(concurrency=int(governor.limit))
+
+    for future in futures:
+        merge(future.result())
+
+    return prices
+
+
+def download_prices_by_date(dates, tickers=None, exchange='USCOMP', page_size=100, requests_per_second=None,
+                            prefetch=False, exchange_api=None):
+    """
+    Download the EOD prices of every security on `exchange` for each of
+    `dates`, a few pages per date instead of one request per ticker.
+
+    https://docs.intrinio.com/documentation/python/get_stock_exchange_prices_v2
+    Only `tickers` are kept when given. `exchange_api` replaces
+    intrinio.StockExchangeApi, e.g. with a local fake. Dates are fetched in
+    order and the download stops at the first date that fails, dropping
+    its partial pages, so stored high-water marks never move past a date
+    that was not retrieved.
+    """
+    governor = make_governor(1, requests_per_second)
+    exchange_api = exchange_api or intrinio.StockExchangeApi()
+    wanted = set(tickers) if tickers is not None else None
+    prices = PriceColumns()
+    progress = Progress('dates', total=len(dates))
+
+    for date in dates:
+        def fetch_page(next_page):
+            return governor.call(
+                exchange_api.get_stock_exchange_prices,
+                exchange,
+                date=date,
+                page_size=page_size,
                 next_page=next_page
             )
-            
-            security = response.security
-            page_prices = len(response.stock_prices)
-            total_prices += page_prices
-            
-            # Process the current page of stock price data
-            for stock_price in response.stock_prices:
-                key = f'{ticker}|{stock_price.date}'
-                data = {
-                    'security_id': security.id,
-                    'company_id': security.company_id,
-                    'ticker': security.ticker,
-                    'date': stock_price.date,
-                    'open': stock_price.open,
-                    'high': stock_price.high,
-                    'low': stock_price.low,
-                    "close": stock_price.close,
-                    'adj_open': stock_price.adj_open,
-                    'adj_high': stock_price.adj_high,
-                    "adj_low": stock_price.adj_low,
-                    "adj_close": stock_price.adj_close,
-                    'adj_volume':stock_price.adj_volume,
-                    'fifty_two_week_high' : stock_price.fifty_two_week_high,
-                    'fifty_two_week_low':stock_price.fifty_two_week_low,
-                    'dividend': stock_price.dividend
-                }
-                results_dictionary[key] = data
-            
-            # Check if there are more pages
-            next_page = response.next_page
-            if not next_page:
-                break
-                
-        print(f'Found {total_prices} prices for: {ticker}')
-        
-    except ApiException as e:
-        print(f"Exception when calling SecurityApi->get_security_stock_prices for {ticker}: {e}")
+
+        day = PriceColumns()
+        try:
+            for response in iter_pages(fetch_page, prefetch):
+                day.add_mixed_page(response.stock_prices, wanted)
+        except ApiException as e:
+            emit('api_error', call='StockExchangeApi->get_stock_exchange_prices', date=date, error=str(e))
+            record(failed_date=date)
+            break
+        prices.extend(day)
+        progress.update(prices=len(prices))
+
+    count_requests(governor)
+    return prices
+
+
+def update_price_store(store, tickers, full_refresh=False, ingest_mode='ticker', bulk_max_days=5,
+                       bulk_kwargs=None, **download_kwargs):
+    """
+    Bring the local price store up to date for `tickers`.
+
+    Each ticker is fetched from the day after its high-water mark, or from
+    `history_start` when it is new to the store. With `full_refresh` the whole
+    history is re-downloaded and replaces what is stored, which picks up
+    corporate-action restatements of the adj_* fields. A ticker whose
+    download fails is neither appended nor replaced, so it keeps its stored
+    history and high-water mark and the next run fetches it again.
+
+    With `ingest_mode` 'date', tickers at most `bulk_max_days` business days
+    behind are updated from the exchange-wide daily prices
+    (download_prices_by_date, with `bulk_kwargs`) and only the rest are
+    fetched per ticker, so a nightly update takes a few pages per day rather
+    than a request per ticker.
+    """
+    if ingest_mode not in ('ticker', 'date'):
+        raise ValueError(f"Unknown ingest_mode: {ingest_mode}")
+    today_str = today.strftime("%Y-%m-%d")
+    start_dates = {}
+    for ticker in tickers:
+        last_seen = None if full_refresh else store.last_date(ticker)
+        start_dates[ticker] = (
+            history_start if last_seen is None
+            else (last_seen + relativedelta(days=1)).strftime("%Y-%m-%d")
+        )
+    # Nothing to ask for when a ticker is already current
+    pending = [t for t in tickers if start_dates[t] <= today_str]
+
+    bulk = set()
+    if ingest_mode == 'date' and not full_refresh:
+        # New tickers need their whole history, which only the per-ticker endpoint serves
+        bulk = {
+            t for t in pending
+            if store.last_date(t) is not None
+            and len(pd.bdate_range(start_dates[t], today_str)) <= bulk_max_days
+        }
+    per_ticker = [t for t in pending if t not in bulk]
+    record(tickers=len(tickers), pending_tickers=len(pending), bulk_tickers=len(bulk))
+
+    prices = download_prices(per_ticker, start_dates=start_dates, **download_kwargs)
+    if bulk:
+        dates = pd.bdate_range(min(start_dates[t] for t in bulk), today_str).strftime("%Y-%m-%d")
+        prices.extend(download_prices_by_date(dates, bulk, **(bulk_kwargs or {})))
+    new_prices = prices.to_frame()
+
+    if new_prices.empty:
+        return
+
+    if bulk:
+        # The shared date range can reach back before a ticker's own start
+        ticker_starts = pd.to_datetime(new_prices['ticker'].cat.categories.map(start_dates))
+        starts = ticker_starts.take(new_prices['ticker'].cat.codes)
+        new_prices = new_prices[~(new_prices['date'] < starts)]
+
+    # Tickers without any returned rows (e.g. API errors) keep their history
+    for ticker, rows in new_prices.groupby('ticker', sort=False, observed=True):
+        if full_refresh:
+            store.replace(ticker, rows)
+        else:
+            store.append(ticker, rows)
 
 
 @data_loader
+@instrumented
 def load_data_from_api(**kwargs) -> DataFrame:
 
-    start_time = datetime.now()
+    config = kwargs.get('configuration') or {}
 
-    selected_universe = get_universe()
+    universe_cache = None
+    if config.get('universe_cache_dir'):
+        ttl_hours = config.get('universe_cache_ttl_hours')
+        universe_cache = ParquetCache(
+            config['universe_cache_dir'],
+            ttl_seconds=ttl_hours * 3600 if ttl_hours is not None else None,
+        )
+
+    with phase('universe'):
+        governor = make_governor(requests_per_second=config.get('requests_per_second'))
+        selected_universe = get_universe(
+            as_of=config.get('universe_date'),
+            cache=universe_cache,
+            page_size=config.get('universe_page_size', 100),
+            prefetch=config.get('universe_prefetch', False),
+            governor=governor,
+        )
+        count_requests(governor)
     tickers = selected_universe.ticker.tolist()
     tickers = ['AAPL', 'IBM'] #DELETE AFTER TESTING
-    print(f'Loading {len(tickers)} tickers') 
-    print(tickers)
-
-    for ticker in tqdm(tickers):
-        work(ticker)
- 
-    df = pd.DataFrame(list(results_dictionary.values()))
-    print(len(df.ticker.unique()))
-    
+    record(tickers=len(tickers))
+
+    download_kwargs = dict(
+        max_workers=config.get('max_workers', 1),
+        requests_per_second=config.get('requests_per_second'),
+        prefetch=config.get('price_prefetch', False),
+    )
+
+    if config.get('price_store_dir'):
+        # Incremental mode: only days after each ticker's high-water mark
+        store = PriceStore(config['price_store_dir'])
+        with phase('update_store'):
+            update_price_store(
+                store,
+                tickers,
+                config.get('full_refresh', False),
+                ingest_mode=config.get('ingest_mode', 'ticker'),
+                bulk_max_days=config.get('bulk_max_days', 5),
+                bulk_kwargs=dict(
+                    exchange=config.get('bulk_exchange', 'USCOMP'),
+                    page_size=config.get('bulk_page_size', 100),
+                    requests_per_second=download_kwargs['requests_per_second'],
+                    prefetch=download_kwargs['prefetch'],
+                ),
+                **download_kwargs,
+            )
+        with phase('read_store'):
+            df = store.read(tickers, start_date=history_start)
+    else:
+        with phase('download'):
+            df = download_prices(tickers, **download_kwargs).to_frame()
+    record(tickers_loaded=df.ticker.nunique())
+
+    if config.get('output_store_dir'):
+        # Downstream blocks memory-map the file and read only their columns
+        with phase('store_frame'):
+            return store_frame(
+                df, config['output_store_dir'], 'marvelous_inventor', config.get('output_store_format', 'arrow'),
+            )
+
     return(df)
\ No newline at end of file
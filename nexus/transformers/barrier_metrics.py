@@ -1,13 +1,25 @@
 import pandas as pd
 import numpy as np
 from typing import List, Dict
+from nexus.utils.block_cache import cached_output, configuration_fingerprint
+from nexus.utils.forward_windows import group_bounds, horizon_days
+from nexus.utils.frame_store import open_frame
+from nexus.utils.incremental import fill_reused, plan_incremental, read_previous, write_previous
+from nexus.utils.instrumentation import instrumented, phase, record
+from nexus.utils.kernels import get_backend
+from nexus.utils.sharding import run_grouped
 
 if 'transformer' not in globals():
     from mage_ai.data_preparation.decorators import transformer
 if 'test' not in globals():
     from mage_ai.data_preparation.decorators import test
 
+# Result metrics per timeframe and barrier, in output column order
+METRICS = ('mean_bb_price', 'pct_above', 'pct_below')
+
 @transformer
+@instrumented
+@cached_output
 def calculate_barrier_metrics(df, *args, **kwargs
 ) -> pd.DataFrame:
     """
@@ -24,6 +36,26 @@ def calculate_barrier_metrics(df, *args, **kwargs
         Number of trading days per year for timeframe conversion
     timeframes_months : List[int], default [3, 6, 9, 12, 15, 18, 24]
         Timeframes in months to calculate
+    max_workers : int, default 1
+        Worker processes for ticker shards; 1 computes in-process
+    backend : str, default 'numpy'
+        Kernel backend: 'numpy', 'numba' or 'polars' (see nexus.utils.kernels).
+        'polars' runs the NumPy barrier kernel, so it only differs from 'numpy'
+        in name
+    incremental_path : str, optional
+        Parquet file holding the previous output. When set, only rows whose
+        forward window reaches new or changed prices are recomputed, and the
+        output is written back for the next run
+    input_columns : List[str], optional
+        Columns read from the upstream output; all when unset. Only a
+        stored output (see nexus.utils.frame_store) skips reading the rest
+    output_dtype : str, default 'float64'
+        dtype of the result columns; 'float32' halves their memory
+    output_format : str, default 'wide'
+        'wide' adds one column per metric, timeframe and barrier. 'long'
+        returns one row per (ticker, date, horizon, barrier, metric) with the
+        result in `value` instead, where `barrier` is the level itself and a
+        repeated level appears once
         
     Returns:
     --------
@@ -32,8 +64,13 @@ def calculate_barrier_metrics(df, *args, **kwargs
         - mean_bb_price{timeframe}mos{barrier_num}: Mean price during barrier breaches
         - pct_above{timeframe}mos{barrier_num}: Percentage of days above barrier
         - pct_below{timeframe}mos{barrier_num}: Percentage of days below barrier
+        or, in long format, columns ticker, date, horizon, barrier, metric, value
+        built straight from the result block, without the wide frame
     """
     
+    # The loader may hand over a reference to its stored output instead
+    df = open_frame(df, kwargs['configuration'].get('input_columns'))
+
     # Validate inputs
     
     required_cols = ['date', 'ticker', 'adj_close']
@@ -49,91 +86,119 @@ def calculate_barrier_metrics(df, *args, **kwargs
 
     trading_days_per_year = kwargs['configuration'].get('trading_days_per_year')
     # Convert timeframes to trading days
-    timeframes_days = {
-        months: int(months * trading_days_per_year / 12) 
-        for months in timeframes_months
-    }
+    timeframes_days = horizon_days(timeframes_months, trading_days_per_year)
+    
+    # Worker processes for ticker shards (1 = in-process)
+    max_workers = kwargs['configuration'].get('max_workers') or 1
+    backend = get_backend(kwargs['configuration'].get('backend'))
+    incremental_path = kwargs['configuration'].get('incremental_path')
+    output_dtype = np.dtype(kwargs['configuration'].get('output_dtype') or 'float64')
+    output_format = kwargs['configuration'].get('output_format') or 'wide'
+    if output_format not in ('wide', 'long'):
+        raise ValueError(f"Unknown output_format: {output_format}")
+    if output_format == 'long':
+        # Rows are keyed by the level, so a repeated level would only repeat them
+        barriers = list(dict.fromkeys(barriers))
     
     # Ensure data is sorted
     df_sorted = df.sort_values(['ticker', 'date']).reset_index(drop=True)
     
-    # Initialize result columns
-    result_cols = {}
-    for months in timeframes_months:
-        for i, barrier in enumerate(barriers, 1):
-            result_cols[f'mean_bb_price{months}mos{i}'] = [np.nan] * len(df_sorted)
-            result_cols[f'pct_above{months}mos{i}'] = [np.nan] * len(df_sorted)
-            result_cols[f'pct_below{months}mos{i}'] = [np.nan] * len(df_sorted)
+    # Ticker groups are contiguous once sorted
+    prices = df_sorted['adj_close'].to_numpy(dtype=np.float64)
+    starts, stops = group_bounds(df_sorted['ticker'].to_numpy())
+    record(tickers=len(starts))
     
-    # Group by ticker for panel processing
-    grouped = df_sorted.groupby('ticker')
+    n_timeframes, n_barriers = len(timeframes_days), len(barriers)
+    result_keys = [
+        (months, b, metric)
+        for months in timeframes_months
+        for b in range(1, n_barriers + 1)
+        for metric in METRICS
+    ]
+    result_names = [f'{metric}{months}mos{b}' for months, b, metric in result_keys]
     
-    for ticker, group in grouped:
-        print(f"Processing {ticker}...")
-        
-        # Convert to numpy arrays for faster computation
-        prices = group['adj_close'].values
-        ticker_indices = group.index.values
-        n_obs = len(prices)
-        
-        # For each observation date
-        for i in range(n_obs):
-            current_price = prices[i]
-            
-            # Calculate barrier prices for this observation
-            barrier_prices = [current_price * barrier for barrier in barriers]
-            
-            # For each timeframe
-            for months in timeframes_months:
-                days_ahead = timeframes_days[months]
-                
-                # Define forward-looking window - SAS style: start from i (inclusive)
-                # toploop = min(observations, target_days) but from current position
-                remaining_obs = n_obs - i
-                actual_window_size = min(remaining_obs, days_ahead)
-                
-                # Extract forward-looking prices INCLUDING current observation (i)
-                # This matches SAS: do j=i to toploop where j starts at i
-                forward_prices = prices[i:i + actual_window_size]
-                total_days = len(forward_prices)
-                
-                # Skip if no forward data
-                if total_days == 0:
-                    continue
-                
-                original_idx = ticker_indices[i]
-                
-                # For each barrier level
-                for barrier_idx, barrier_price in enumerate(barrier_prices, 1):
-                    
-                    # Calculate above/below barrier masks
-                    above_barrier_mask = forward_prices >= forward_prices[0]
-                    below_barrier_mask = forward_prices < barrier_price
-                    
-                    # Calculate percentages
-                    days_above = np.sum(above_barrier_mask)
-                    days_below = np.sum(below_barrier_mask)
-                    
-                    pct_above = days_above / total_days if total_days > 0 else 0
-                    pct_below = days_below / total_days if total_days > 0 else 0
-                    
-                    # Store percentage results
-                    result_cols[f'pct_above{months}mos{barrier_idx}'][original_idx] = pct_above
-                    result_cols[f'pct_below{months}mos{barrier_idx}'][original_idx] = pct_below
-                    
-                    # Calculate mean breach price (only if there were breaches)
-                    if days_below > 0:
-                        below_barrier_prices = forward_prices[below_barrier_mask]
-                        mean_bb_price = np.mean(below_barrier_prices)
-                        result_cols[f'mean_bb_price{months}mos{barrier_idx}'][original_idx] = mean_bb_price
+    # Incremental mode: only the tail of each ticker whose forward window
+    # reaches new or changed prices is recomputed
+    compute_starts, plan = starts, None
+    # Results of another configuration are never reused
+    fingerprint = configuration_fingerprint(kwargs['configuration'])
+    previous = read_previous(incremental_path, result_names, fingerprint=fingerprint)
+    if previous is not None:
+        plan = plan_incremental(df_sorted, previous, starts, stops, depth=max(timeframes_days))
+        compute_starts = plan.compute_starts
+        record(reused_rows=len(plan.reuse_rows))
     
-    # Add calculated columns to original dataframe
-    result_df = df_sorted.copy()
-    for col_name, values in result_cols.items():
-        result_df[col_name] = values
+    # One contiguous (column, row) block in result_names order; each column is
+    # a contiguous row of it, and pandas takes its transpose without copying
+    n_rows = len(df_sorted)
+    block = np.empty((len(result_names), n_rows), dtype=output_dtype)
+    cells = block.reshape(n_timeframes, n_barriers, len(METRICS), n_rows)
+    
+    # All observations, timeframes and barriers of each ticker at once, written
+    # into the block by the kernels (copied in once from worker processes)
+    with phase('kernels', backend=backend.name):
+        run_grouped(
+            backend.barrier_metrics,
+            prices,
+            compute_starts,
+            stops,
+            output_shapes=[(n_timeframes,), (n_timeframes, n_barriers), (n_timeframes, n_barriers)],
+            args=(barriers, timeframes_days),
+            max_workers=max_workers,
+            out=[cells[:, 0, 1], cells[:, :, 2], cells[:, :, 0]],
+        )
+    # pct_above does not depend on the barrier; it was written for the first
+    cells[:, 1:, 1] = cells[:, :1, 1]
     
+    if plan is not None:
+        fill_reused(dict(zip(result_names, block)), previous, plan)
+    
+    if output_format == 'long':
+        if incremental_path:
+            keys = df_sorted[['ticker', 'date', 'adj_close']]
+            write_previous(
+                pd.concat([keys, pd.DataFrame(block.T, columns=result_names, index=keys.index, copy=False)], axis=1),
+                incremental_path,
+                fingerprint,
+            )
+        return long_format(df_sorted[['ticker', 'date']], block, result_keys, barriers)
+    
+    # Add calculated columns to original dataframe
+    result_df = pd.concat(
+        [
+            df_sorted.drop(columns=result_names, errors='ignore'),
+            pd.DataFrame(block.T, columns=result_names, index=df_sorted.index, copy=False),
+        ],
+        axis=1,
+    )
+    write_previous(result_df, incremental_path, fingerprint)
     return result_df
 
+
+def long_format(keys: pd.DataFrame, block: np.ndarray, result_keys: List[tuple],
+                barriers: List[float]) -> pd.DataFrame:
+    """
+    Stack a (column, row) result block into one row per key row and column.
+    
+    The block is read in memory order, so `value` is the block raveled without
+    a copy, and the key columns repeat once per column, the ticker as a
+    categorical so it is not repeated as strings. Barrier numbers in
+    `result_keys` are 1-based positions in `barriers`, whose levels fill the
+    `barrier` column.
+    """
+    n_cols, n_rows = block.shape
+    months, barrier, metric = zip(*result_keys)
+    keys = keys.astype({'ticker': 'category'})
+    long_df = keys.iloc[np.tile(np.arange(n_rows), n_cols)].reset_index(drop=True)
+    return long_df.assign(**{
+        'horizon': np.repeat(np.asarray(months, dtype=np.int16), n_rows),
+        'barrier': np.repeat(np.asarray(barriers, dtype=np.float64)[np.asarray(barrier) - 1], n_rows),
+        'metric': pd.Categorical.from_codes(
+            np.repeat([METRICS.index(m) for m in metric], n_rows), categories=list(METRICS)
+        ),
+        'value': block.ravel(),
+    })
+
 @test
 def test_output(output, *args) -> None:
     """
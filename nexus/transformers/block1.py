@@ -1,9 +1,8 @@
-from mage_ai.data_cleaner.transformer_actions.constants import ImputationStrategy
-from mage_ai.data_cleaner.transformer_actions.base import BaseAction
-from mage_ai.data_cleaner.transformer_actions.constants import ActionType, Axis
-from mage_ai.data_cleaner.transformer_actions.utils import build_transformer_action
 from pandas import DataFrame
 import numpy as np
+import pandas as pd
+from nexus.utils.instrumentation import instrumented
+from nexus.utils.kernels import get_backend
 
 if 'transformer' not in globals():
     from mage_ai.data_preparation.decorators import transformer
@@ -12,6 +11,7 @@ if 'test' not in globals():
 
 
 @transformer
+@instrumented
 def add_forward_weights(df, *args, **kwargs):
     """
     Add weight columns for forward-looking analysis periods to handle edge effects.
@@ -24,6 +24,14 @@ def add_forward_weights(df, *args, **kwargs):
         List of timeframes in months. Default: [3, 6, 9, 12, 15, 18, 24]
     trading_days_per_month : int, optional
         Trading days per month. Default: 21 (252 trading days / 12 months)
+    group_by : str or list, optional
+        Panel key (e.g. 'ticker'). When set, each group's rows must be in date
+        order and weights restart at every group boundary.
+    verbose : bool, optional
+        Print the tail of the result. Default: False
+    backend : str, optional
+        Kernel backend: 'numpy', 'numba' or 'polars'. Default: 'numpy'. The
+        weights kernel of 'polars' is the NumPy one
     
     Returns:
     --------
@@ -32,40 +40,34 @@ def add_forward_weights(df, *args, **kwargs):
     """
     trading_days_per_month = kwargs['configuration'].get('trading_days_per_month')
     timeframes_months = kwargs['configuration'].get('timeframes_months')
+    group_by = kwargs['configuration'].get('group_by')
+    verbose = kwargs['configuration'].get('verbose', False)
+    backend = get_backend(kwargs['configuration'].get('backend'))
 
     if timeframes_months is None:
         timeframes_months = [3, 6, 9, 12, 15, 18, 24]
     
-    # Create a copy to avoid modifying original
-    result_df = df.copy()
+    # Convert months to trading days
+    taus = [months * trading_days_per_month for months in timeframes_months]
+    weight_cols = [f'wgt{months}mos' for months in timeframes_months]
     
-    # Total number of observations
-    total_obs = len(df)
+    # Observations left in each series, current one included
+    if group_by:
+        # Panel mode: the window resets at every group (e.g. ticker) boundary
+        remaining = df.groupby(group_by, sort=False, dropna=False, observed=True).cumcount(ascending=False).to_numpy() + 1
+    else:
+        remaining = len(df) - np.arange(len(df))
     
-    # Calculate weights for each timeframe
-    for months in timeframes_months:
-        # Convert months to trading days
-        tau = months * trading_days_per_month
-        
-        # Create weight column name
-        weight_col = f'wgt{months}mos'
-        
-        # Calculate weights for each observation
-        weights = []
-        
-        for i in range(total_obs):
-            # Calculate end point of forward window
-            end_point = min(i + tau - 1, total_obs - 1)
-            
-            # Calculate actual days available vs requested
-            days_available = end_point - i + 1
-            
-            # Weight = actual days / requested days
-            weight = days_available / tau
-            
-            weights.append(weight)
-        
-        # Add weight column to DataFrame
-        result_df[weight_col] = weights
-    print(result_df.tail(50))
-    return result_df
\ No newline at end of file
+    # Weight = actual days / requested days, for all timeframes at once
+    weights = backend.forward_weights(remaining, taus)
+    
+    result_df = pd.concat(
+        [
+            df.drop(columns=weight_cols, errors='ignore'),
+            pd.DataFrame(weights, index=df.index, columns=weight_cols),
+        ],
+        axis=1,
+    )
+    if verbose:
+        print(result_df.tail(50))
+    return result_df
@@ -1,30 +1,77 @@
 from pandas import DataFrame
-import math
+from typing import List, Optional, Union
 
 if 'transformer' not in globals():
     from mage_ai.data_preparation.decorators import transformer
 if 'test' not in globals():
     from mage_ai.data_preparation.decorators import test
 
-def select_number_columns(df: DataFrame) -> DataFrame:
-    return df[['Age', 'Fare', 'Parch', 'Pclass', 'SibSp', 'Survived']]
+# Statistics that pandas computes per column (and per group) in cython
+STATISTICS = ('median', 'mean', 'min', 'max')
 
 
-def fill_missing_values_with_median(df: DataFrame) -> DataFrame:
-    for col in df.columns:
-        values = sorted(df[col].dropna().tolist())
-        median_value = values[math.floor(len(values) / 2)]
-        df[[col]] = df[[col]].fillna(median_value)
+def select_number_columns(df: DataFrame, columns: Optional[List[str]] = None) -> DataFrame:
+    """The given columns, or every numeric column."""
+    if columns:
+        return df[columns]
+    return df.select_dtypes('number')
+
+
+def fill_missing_values(df: DataFrame, statistic: str = 'median', columns: Optional[List[str]] = None,
+                        group_by: Optional[Union[str, List[str]]] = None,
+                        global_fallback: bool = True) -> DataFrame:
+    """
+    Fill missing values of numeric columns in place with a column statistic.
+
+    The statistic is computed for all columns at once, per group when
+    `group_by` is set (e.g. per ticker). Groups with no observed value in a
+    column take the statistic over the whole column when `global_fallback`
+    is set, and stay missing otherwise. Only missing cells are written, with
+    no per-column frame copies.
+    """
+    if statistic not in STATISTICS:
+        raise ValueError(f"Unknown statistic {statistic}; expected one of {list(STATISTICS)}")
+    keys = [group_by] if isinstance(group_by, str) else list(group_by or [])
+    columns = [col for col in select_number_columns(df, columns).columns if col not in keys]
+    if not columns:
+        return df
+
+    if not group_by:
+        df.fillna(df[columns].agg(statistic), inplace=True)
+        return df
+
+    grouped = df.groupby(group_by, sort=False, dropna=False, observed=True)
+    # One (groups, columns) table, numbered like ngroup()
+    stats = grouped[columns].agg(statistic).reset_index(drop=True)
+    if global_fallback:
+        stats = stats.fillna(df[columns].agg(statistic))
+    codes = grouped.ngroup().to_numpy()
+
+    for col in columns:
+        missing = df[col].isna().to_numpy()
+        if missing.any():
+            df.loc[missing, col] = stats[col].to_numpy()[codes[missing]]
     return df
 
 
+def fill_missing_values_with_median(df: DataFrame) -> DataFrame:
+    return fill_missing_values(df, 'median')
+
+
 @transformer
 def transform_df(df: DataFrame, *args, **kwargs) -> DataFrame:
     """
-    Template code for a transformer block.
+    Impute missing values of numeric columns.
 
-    Add more parameters to this function if this block has multiple parent blocks.
-    There should be one parameter for each output variable from each parent block.
+    Configuration:
+        columns (list, optional): Columns to impute. Default: every numeric column
+        statistic (str, optional): 'median', 'mean', 'min' or 'max'. Default: 'median'
+        group_by (str or list, optional): Compute the statistic per group,
+            e.g. 'ticker' on the EOD panel
+        global_fallback (bool, optional): Fill groups without any value from
+            the whole column. Default: True
+        keep_all_columns (bool, optional): Return every column rather than
+            only the imputed ones. Default: False
 
     Args:
         df (DataFrame): Data frame from parent block.
@@ -32,9 +79,24 @@ def transform_df(df: DataFrame, *args, **kwargs) -> DataFrame:
     Returns:
         DataFrame: Transformed data frame
     """
-    # Specify your transformation logic here
+    configuration = kwargs.get('configuration') or {}
+    columns = configuration.get('columns')
+    group_by = configuration.get('group_by')
+
+    if not configuration.get('keep_all_columns'):
+        # Group keys are kept alongside the imputed columns
+        keys = [group_by] if isinstance(group_by, str) else list(group_by or [])
+        selected = [col for col in select_number_columns(df, columns).columns if col not in keys]
+        df = df[keys + selected].copy()
+        columns = selected
 
-    return fill_missing_values_with_median(select_number_columns(df))
+    return fill_missing_values(
+        df,
+        statistic=configuration.get('statistic') or 'median',
+        columns=columns,
+        group_by=group_by,
+        global_fallback=configuration.get('global_fallback', True),
+    )
 
 
 @test
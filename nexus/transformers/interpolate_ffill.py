@@ -2,6 +2,7 @@ from mage_ai.data_cleaner.transformer_actions.base import BaseAction
 from mage_ai.data_cleaner.transformer_actions.constants import ActionType, Axis
 from mage_ai.data_cleaner.transformer_actions.utils import build_transformer_action
 from pandas import DataFrame
+from nexus.utils.instrumentation import instrumented
 
 if 'transformer' not in globals():
     from mage_ai.data_preparation.decorators import transformer
@@ -10,6 +11,7 @@ if 'test' not in globals():
 
 
 @transformer
+@instrumented
 def execute_transformer_action(df: DataFrame, *args, **kwargs) -> DataFrame:
     """
     Execute Transformer Action: ActionType.DIFF
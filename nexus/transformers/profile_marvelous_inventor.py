@@ -0,0 +1,45 @@
+from nexus.utils.frame_store import open_frame
+from nexus.utils.instrumentation import instrumented
+from nexus.utils.profiling import CHUNK_ROWS, profile_frame
+
+if 'transformer' not in globals():
+    from mage_ai.data_preparation.decorators import transformer
+if 'test' not in globals():
+    from mage_ai.data_preparation.decorators import test
+
+
+@transformer
+@instrumented
+def profile_prices(df, *args, **kwargs):
+    """
+    Profile the loader output in one pass over row chunks.
+
+    Produces one row per column with null counts, approximate distinct
+    counts, min/max and sampled quantiles (see nexus.utils.profiling). The
+    missing and unique values charts read this profile rather than the
+    full panel. A stored loader output (see nexus.utils.frame_store) is
+    opened memory-mapped.
+
+    Configuration:
+        chunk_rows (int, optional): Rows per chunk. Default: 250000
+        precision (int, optional): HyperLogLog precision; error is about
+            1.04 / sqrt(2**precision). Default: 14
+        sample_size (int, optional): Values sampled per column for quantiles.
+            Default: 4096
+    """
+    configuration = kwargs.get('configuration') or {}
+    return profile_frame(
+        open_frame(df),
+        chunk_rows=configuration.get('chunk_rows') or CHUNK_ROWS,
+        precision=configuration.get('precision') or 14,
+        sample_size=configuration.get('sample_size') or 4096,
+    )
+
+
+@test
+def test_output(output, *args) -> None:
+    """
+    Template code for testing the output of the block.
+    """
+    assert output is not None, 'The output is undefined'
+    assert {'column', 'null_count', 'approx_distinct'}.issubset(output.columns)
@@ -1,12 +1,58 @@
 # merge_deduplicate_flexible_block.py
+import numpy as np
 import pandas as pd
+from nexus.utils.instrumentation import emit, instrumented, record
+
+
+def merge_on_key(dataframes, key):
+    """
+    Left-join upstream frames onto the first one by `key` columns.
+
+    Only columns not already present are taken from each later frame, so the
+    cost grows with the columns added rather than with rows x all columns.
+    When a frame's key columns are already row-aligned with the first frame
+    (the usual case for transformers on the same sorted panel), its columns
+    are attached without any lookup.
+    """
+    base = dataframes[0].reset_index(drop=True)
+    base_keys = None
+    parts = [base]
+    seen = set(base.columns)
+
+    for df in dataframes[1:]:
+        new_cols = [col for col in df.columns if col not in seen]
+        if not new_cols:
+            continue
+        seen.update(new_cols)
+
+        aligned = len(df) == len(base) and all(
+            np.array_equal(df[col].to_numpy(), base[col].to_numpy()) for col in key
+        )
+        if aligned:
+            added = df[new_cols].reset_index(drop=True)
+        else:
+            if base_keys is None:
+                base_keys = pd.MultiIndex.from_frame(base[key])
+            right = df[new_cols].set_axis(pd.MultiIndex.from_frame(df[key]))
+            if not right.index.is_unique:
+                raise ValueError(f"Merge key {key} is not unique in an upstream DataFrame")
+            added = right.reindex(base_keys).reset_index(drop=True)
+        parts.append(added)
+
+    return pd.concat(parts, axis=1)
+
 
 @transformer
+@instrumented
 def merge_and_deduplicate_flexible(*dataframes_to_merge, **kwargs):
     """
     Merges data from an arbitrary number of upstream transformer blocks
     and drops duplicates.
 
+    If the block configuration sets `merge_key` (e.g. [ticker, date]), the
+    frames are instead joined on that key, taking only each upstream's new
+    columns.
+
     Args:
         *dataframes_to_merge: A variable number of pd.DataFrame objects
                               passed as positional arguments from upstream blocks.
@@ -16,26 +62,28 @@ def merge_and_deduplicate_flexible(*dataframes_to_merge, **kwargs):
         pd.DataFrame: Merged and deduplicated DataFrame.
     """
     if not dataframes_to_merge:
-        print("No DataFrames received for merging. Returning empty DataFrame.")
         return pd.DataFrame()
 
-    print(f"Received {len(dataframes_to_merge)} DataFrames for merging.")
-
     # Log shapes of incoming DataFrames for debugging
+    record(input_shapes=[list(df.shape) if isinstance(df, pd.DataFrame) else None for df in dataframes_to_merge])
     for i, df in enumerate(dataframes_to_merge):
-        if isinstance(df, pd.DataFrame):
-            print(f"  DataFrame {i+1} shape: {df.shape}")
-        else:
-            print(f"  Warning: Argument {i+1} is not a DataFrame: {type(df)}")
+        if not isinstance(df, pd.DataFrame):
+            emit('warning', message=f"Argument {i+1} is not a DataFrame: {type(df)}")
+
+    # Key-based mode: join each upstream's new columns on e.g. (ticker, date)
+    merge_key = (kwargs.get('configuration') or {}).get('merge_key')
+    if merge_key:
+        merged_df = merge_on_key(list(dataframes_to_merge), list(merge_key))
+        record(merge_key=list(merge_key), output_shape=list(merged_df.shape))
+        return merged_df
 
     # 1. Merge the data
     # Use pd.concat to stack all DataFrames
     # It's robust to different column sets, filling missing with NaN
     try:
         merged_df = pd.concat(list(dataframes_to_merge), ignore_index=True)
-        print("Shape after concatenation:", merged_df.shape)
     except Exception as e:
-        print(f"Error during concatenation: {e}")
+        emit('error', message=f"Error during concatenation: {e}")
         # Depending on your error strategy, you might want to re-raise or return empty
         return pd.DataFrame()
 
@@ -47,7 +95,6 @@ def merge_and_deduplicate_flexible(*dataframes_to_merge, **kwargs):
     deduplicated_df = merged_df.drop_duplicates()
     final_rows = deduplicated_df.shape[0]
 
-    print(f"Shape after deduplication: {deduplicated_df.shape}")
-    print(f"Dropped {initial_rows - final_rows} duplicate rows.")
+    record(output_shape=list(deduplicated_df.shape), duplicates_dropped=initial_rows - final_rows)
 
     return deduplicated_df
\ No newline at end of file
@@ -0,0 +1,79 @@
+from typing import Dict, Iterable, NamedTuple, Optional
+
+import numpy as np
+import pandas as pd
+
+
+class Release(NamedTuple):
+    """
+    When a series' observations become known.
+
+    `frequency` is the period each observation covers (a pandas period
+    alias such as 'D', 'W', 'M' or 'Q'; FRED dates an observation at the
+    start of its period). An observation is available `lag_days` calendar
+    days after its period ends.
+    """
+    frequency: str
+    lag_days: int = 0
+
+
+def business_calendar(start, end, holidays: Optional[Iterable] = None) -> pd.DatetimeIndex:
+    """Business days from `start` to `end`, excluding `holidays`."""
+    if holidays:
+        return pd.bdate_range(start, end, freq='C', holidays=list(holidays))
+    return pd.bdate_range(start, end)
+
+
+def available_dates(dates: pd.DatetimeIndex, release: Release) -> np.ndarray:
+    """Dates on which observations dated `dates` are published."""
+    dates = pd.DatetimeIndex(dates)
+    if release.frequency != 'D':
+        dates = dates.to_period(release.frequency).end_time.normalize()
+    return (dates + pd.Timedelta(days=release.lag_days)).to_numpy(dtype='datetime64[ns]')
+
+
+def asof_positions(keys: np.ndarray, targets: np.ndarray) -> np.ndarray:
+    """
+    Position of the last of the sorted `keys` at or before each target, or
+    -1 where there is none.
+    """
+    return np.searchsorted(keys, targets, side='right') - 1
+
+
+def take_asof(values: np.ndarray, positions: np.ndarray) -> np.ndarray:
+    # Missing positions read NaN instead of wrapping around to the last value
+    out = values.astype(np.float64, copy=False).take(np.maximum(positions, 0))
+    out[positions < 0] = np.nan
+    return out
+
+
+def asof_series(series: pd.Series, calendar: pd.DatetimeIndex, release: Release) -> np.ndarray:
+    """
+    Value of `series` known on each day of `calendar`: its latest
+    observation published on or before that day, honouring `release`.
+    """
+    series = series.dropna().sort_index()
+    keys = available_dates(series.index, release)
+    # Publication dates follow observation dates; where several share one,
+    # the latest observation wins
+    positions = asof_positions(keys, calendar.to_numpy(dtype='datetime64[ns]'))
+    return take_asof(series.to_numpy(), positions)
+
+
+def align_asof(series_data: Dict[str, pd.Series], calendar: pd.DatetimeIndex,
+               releases: Dict[str, Release], default: Release = Release('D')) -> pd.DataFrame:
+    """
+    Point-in-time daily frame of `series_data` on `calendar`.
+
+    Each series is looked up as of every calendar day with its own release
+    frequency and publication lag (`releases`, else `default`), by binary
+    search over its publication dates. No union of observation dates is
+    built and nothing is forward-filled afterwards: a day without a new
+    observation carries the latest published one, and days before the first
+    publication are NaN.
+    """
+    columns = {
+        code: asof_series(series, calendar, releases.get(code, default))
+        for code, series in series_data.items()
+    }
+    return pd.DataFrame(columns, index=calendar)
@@ -0,0 +1,119 @@
+import functools
+import glob
+import hashlib
+import inspect
+import json
+import marshal
+import os
+from typing import Iterable
+
+import numpy as np
+import pandas as pd
+
+from nexus.utils.cache import LRUParquetCache
+from nexus.utils.instrumentation import record
+
+# Configuration keys that change how a block runs, not what it returns
+NON_SEMANTIC_KEYS = {
+    'file_path', 'file_source', 'max_workers', 'incremental_path', 'metrics_path',
+    'output_cache_dir', 'output_cache_max_mb',
+}
+
+# Default bound of a block output cache directory
+OUTPUT_CACHE_MAX_MB = 4096
+
+UTILS_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_DIR = os.path.dirname(UTILS_DIR)
+
+
+def frame_fingerprint(df: pd.DataFrame) -> str:
+    """Digest of a frame's values, index, column names and dtypes."""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(json.dumps([[str(c), str(t)] for c, t in df.dtypes.items()]).encode())
+    digest.update(np.ascontiguousarray(pd.util.hash_pandas_object(df, index=True).to_numpy()).tobytes())
+    return digest.hexdigest()
+
+
+def block_source(function, configuration: dict = None) -> bytes:
+    """
+    Source of a block function.
+
+    Mage runs block content with exec on the source string, so the code
+    object's file name is '<string>'. The block file is then taken from the
+    configuration's `file_path` (relative to the project), and failing that
+    the function's own source or, last, its compiled code.
+    """
+    candidates = [inspect.getsourcefile(function)]
+    file_path = (configuration or {}).get('file_path')
+    if file_path:
+        candidates.append(os.path.join(PROJECT_DIR, file_path))
+    for path in candidates:
+        if path and os.path.isfile(path):
+            with open(path, 'rb') as f:
+                return f.read()
+    try:
+        return inspect.getsource(function).encode()
+    except (OSError, TypeError):
+        return marshal.dumps(function.__code__)
+
+
+def code_fingerprint(paths: Iterable[str], source: bytes = b'') -> str:
+    """Digest of a block's `source` and the files it depends on."""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(source)
+    for path in sorted(paths):
+        with open(path, 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+def configuration_fingerprint(configuration: dict) -> str:
+    """Digest of the block configuration, leaving out NON_SEMANTIC_KEYS."""
+    semantic = {k: v for k, v in (configuration or {}).items() if k not in NON_SEMANTIC_KEYS}
+    return hashlib.blake2b(json.dumps(semantic, sort_keys=True, default=str).encode(), digest_size=16).hexdigest()
+
+
+def block_cache_key(df: pd.DataFrame, configuration: dict, code_version: str) -> str:
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(frame_fingerprint(df).encode())
+    digest.update(configuration_fingerprint(configuration).encode())
+    digest.update(code_version.encode())
+    return digest.hexdigest()
+
+
+def cached_output(function):
+    """
+    Cache a transformer block's output on local disk, keyed by its input
+    frame, its configuration and the code that computes it.
+
+    Place it under @transformer. When the block configuration sets
+    `output_cache_dir`, a hit returns the stored output without calling the
+    block; a miss computes and stores it. Entries are Parquet files evicted
+    least recently used first beyond `output_cache_max_mb`. The code version
+    covers the block source (see block_source) and every module in
+    nexus/utils, so editing either invalidates old entries. Settings in
+    NON_SEMANTIC_KEYS are ignored.
+    """
+    utils_paths = glob.glob(os.path.join(UTILS_DIR, '*.py'))
+
+    @functools.wraps(function)
+    def wrapper(df, *args, **kwargs):
+        configuration = kwargs.get('configuration') or {}
+        root = configuration.get('output_cache_dir')
+        if not root:
+            return function(df, *args, **kwargs)
+
+        max_mb = configuration.get('output_cache_max_mb') or OUTPUT_CACHE_MAX_MB
+        cache = LRUParquetCache(root, max_bytes=max_mb * 2**20)
+        code_version = code_fingerprint(utils_paths, block_source(function, configuration))
+        key = block_cache_key(df, configuration, code_version)
+        output = cache.get(key)
+        record(output_cache='hit' if output is not None else 'miss', output_cache_key=key)
+        if output is not None:
+            return output
+
+        output = function(df, *args, **kwargs)
+        cache.put(key, output)
+        return output
+
+    return wrapper
@@ -0,0 +1,102 @@
+import os
+import time
+from typing import List, Optional, Tuple
+from urllib.parse import quote
+
+import pandas as pd
+
+
+class ParquetCache:
+    """
+    Local directory of DataFrames stored as Parquet, one file per key.
+
+    Entries older than `ttl_seconds` (by file modification time) are treated
+    as missing. Writes go to a temporary file first so readers never see a
+    partial entry.
+    """
+
+    def __init__(self, root: str, ttl_seconds: Optional[float] = None):
+        self.root = root
+        self.ttl_seconds = ttl_seconds
+        os.makedirs(root, exist_ok=True)
+
+    def path(self, key: str) -> str:
+        return os.path.join(self.root, f"{quote(str(key), safe='')}.parquet")
+
+    def is_fresh(self, key: str) -> bool:
+        path = self.path(key)
+        if not os.path.exists(path):
+            return False
+        if self.ttl_seconds is None:
+            return True
+        return time.time() - os.path.getmtime(path) <= self.ttl_seconds
+
+    def get(self, key: str) -> Optional[pd.DataFrame]:
+        if not self.is_fresh(key):
+            return None
+        return pd.read_parquet(self.path(key))
+
+    def put(self, key: str, df: pd.DataFrame) -> None:
+        path = self.path(key)
+        df.to_parquet(f'{path}.tmp')
+        os.replace(f'{path}.tmp', path)
+
+    def delete(self, key: str) -> None:
+        if os.path.exists(self.path(key)):
+            os.remove(self.path(key))
+
+
+class LRUParquetCache(ParquetCache):
+    """
+    ParquetCache bounded to `max_bytes` on disk and, optionally,
+    `max_entries` files. Least recently used entries are evicted first after
+    every write.
+
+    A read marks an entry as used by setting its access time; the
+    modification time, and with it the TTL, is left alone. The newest entry
+    is never evicted, even if it alone exceeds the bound.
+    """
+
+    def __init__(self, root: str, max_bytes: int, max_entries: Optional[int] = None,
+                 ttl_seconds: Optional[float] = None):
+        super().__init__(root, ttl_seconds)
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+
+    def get(self, key: str) -> Optional[pd.DataFrame]:
+        df = super().get(key)
+        if df is not None:
+            path = self.path(key)
+            os.utime(path, (time.time(), os.path.getmtime(path)))
+        return df
+
+    def put(self, key: str, df: pd.DataFrame) -> None:
+        super().put(key, df)
+        self.evict()
+
+    def entries(self) -> List[Tuple[float, int, str]]:
+        """(last use, size in bytes, path) of every entry, least recently used first."""
+        entries = []
+        for name in os.listdir(self.root):
+            if not name.endswith('.parquet'):
+                continue
+            path = os.path.join(self.root, name)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            entries.append((max(stat.st_atime, stat.st_mtime), stat.st_size, path))
+        return sorted(entries)
+
+    def evict(self) -> None:
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        while len(entries) > 1 and (
+            total > self.max_bytes or (self.max_entries is not None and len(entries) > self.max_entries)
+        ):
+            _, size, path = entries.pop(0)
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
@@ -0,0 +1,117 @@
+import numpy as np
+import pandas as pd
+
+# Identifier columns, stored once per page and expanded as categoricals
+ID_FIELDS = ['security_id', 'company_id', 'ticker']
+
+# Stock price fields and their column dtypes. The adjusted series feed the
+# forward-window features and keep full precision; the rest are informational.
+PRICE_FIELDS = {
+    'open': np.float32,
+    'high': np.float32,
+    'low': np.float32,
+    'close': np.float32,
+    'adj_open': np.float64,
+    'adj_high': np.float64,
+    'adj_low': np.float64,
+    'adj_close': np.float64,
+    'adj_volume': np.float64,
+    'fifty_two_week_high': np.float32,
+    'fifty_two_week_low': np.float32,
+    'dividend': np.float32,
+}
+
+COLUMNS = ['security_id', 'company_id', 'ticker', 'date', *PRICE_FIELDS]
+
+
+class PriceColumns:
+    """
+    Column-oriented accumulator for Intrinio stock price pages.
+
+    Each page is converted straight into typed NumPy chunks (one per column)
+    instead of one dict per row. Builders from different workers are merged
+    with `extend` and turned into a frame once with `to_frame`.
+    """
+
+    def __init__(self):
+        self._dates = []
+        self._values = {field: [] for field in PRICE_FIELDS}
+        # (security_id, company_id, ticker, row count) per page
+        self._ids = []
+
+    def __len__(self) -> int:
+        return sum(page[-1] for page in self._ids)
+
+    def _append_values(self, stock_prices) -> None:
+        # np.array maps missing (None) values to NaN / NaT
+        self._dates.append(np.array([p.date for p in stock_prices], dtype='datetime64[D]'))
+        for field, dtype in PRICE_FIELDS.items():
+            self._values[field].append(
+                np.array([getattr(p, field) for p in stock_prices], dtype=dtype)
+            )
+
+    def add_page(self, security, stock_prices) -> None:
+        n = len(stock_prices)
+        if n == 0:
+            return
+        self._append_values(stock_prices)
+        self._ids.append((security.id, security.company_id, security.ticker, n))
+
+    def add_mixed_page(self, stock_prices, tickers=None) -> None:
+        """
+        Add a page mixing securities, where every price carries its own
+        `security` (e.g. one date of a stock exchange's prices). With
+        `tickers`, a set, prices of other tickers are skipped.
+        """
+        if tickers is not None:
+            stock_prices = [p for p in stock_prices if p.security.ticker in tickers]
+        if not stock_prices:
+            return
+        self._append_values(stock_prices)
+        # Consecutive prices of the same security share one id run
+        for p in stock_prices:
+            security = p.security
+            if self._ids and self._ids[-1][0] == security.id:
+                self._ids[-1] = (*self._ids[-1][:3], self._ids[-1][3] + 1)
+            else:
+                self._ids.append((security.id, security.company_id, security.ticker, 1))
+
+    def extend(self, other: 'PriceColumns') -> None:
+        self._dates.extend(other._dates)
+        for field in PRICE_FIELDS:
+            self._values[field].extend(other._values[field])
+        self._ids.extend(other._ids)
+
+    def _id_column(self, position: int, counts: np.ndarray) -> pd.Categorical:
+        values = [page[position] for page in self._ids]
+        codes, categories = pd.factorize(pd.Series(values, dtype=object), sort=True)
+        return pd.Categorical.from_codes(np.repeat(codes, counts), categories=categories)
+
+    def to_frame(self, dedup: bool = True) -> pd.DataFrame:
+        """
+        Build the price frame. With `dedup`, only the last row seen for each
+        (ticker, date) is kept, like re-assigning a 'ticker|date' dict key.
+        """
+        if not self._ids:
+            return pd.DataFrame(columns=COLUMNS)
+
+        counts = np.array([page[-1] for page in self._ids])
+        columns = {field: self._id_column(i, counts) for i, field in enumerate(ID_FIELDS)}
+        columns['date'] = np.concatenate(self._dates).astype('datetime64[ns]')
+        for field in PRICE_FIELDS:
+            columns[field] = np.concatenate(self._values[field])
+
+        keep = None
+        if dedup:
+            ticker_codes = columns['ticker'].codes
+            day = columns['date'].view(np.int64)
+            # Reverse so the first occurrence found is the last one written
+            key = np.stack([ticker_codes[::-1], day[::-1]], axis=1)
+            _, first = np.unique(key, axis=0, return_index=True)
+            if len(first) < len(day):
+                keep = np.sort(len(day) - 1 - first)
+
+        df = pd.DataFrame(columns)[COLUMNS]
+        if keep is not None:
+            df = df.take(keep).reset_index(drop=True)
+        return df
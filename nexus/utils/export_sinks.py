@@ -0,0 +1,218 @@
+import abc
+import os
+import shutil
+import tempfile
+import uuid
+from typing import Optional
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+# Default in-memory size of each exported chunk
+CHUNK_BYTES = 256 * 2**20
+
+
+class ChunkSink(abc.ABC):
+    """
+    Destination for a table exported as a sequence of Parquet chunk files.
+
+    `begin` is called once with the if_exists policy ('replace', 'append' or
+    'fail'), `write` once per chunk in order, and `finish` after the last
+    chunk. If anything fails in between, `abort` is called instead of
+    `finish`. `write` may take ownership of the chunk file. Subclasses must
+    implement `write` and `finish`.
+    """
+
+    def begin(self, table_id: str, if_exists: str) -> None:
+        pass
+
+    @abc.abstractmethod
+    def write(self, table_id: str, index: int, path: str) -> None:
+        """Load chunk number `index` from `path`."""
+
+    @abc.abstractmethod
+    def finish(self, table_id: str) -> None:
+        """Publish the chunks written since `begin`."""
+
+    def abort(self, table_id: str) -> None:
+        pass
+
+
+class LocalDirectorySink(ChunkSink):
+    """
+    Writes chunks to <root>/<table_id>/part-NNNNN.parquet.
+
+    Chunks are staged in a sibling directory and only moved into the table
+    by `finish`, so a failed export leaves the table as it was. A
+    network-free stand-in for a warehouse, e.g. for testing and
+    benchmarking the chunked export path (see nexus.benchmarks.export).
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+        self._if_exists = 'append'
+
+    def table_dir(self, table_id: str) -> str:
+        return os.path.join(self.root, table_id)
+
+    def staging_dir(self, table_id: str) -> str:
+        return os.path.join(self.root, f'.{table_id}.staging')
+
+    def begin(self, table_id: str, if_exists: str) -> None:
+        if if_exists == 'fail' and os.path.isdir(self.table_dir(table_id)):
+            raise ValueError(f"Table {table_id} already exists in {self.root}")
+        self._if_exists = if_exists
+        shutil.rmtree(self.staging_dir(table_id), ignore_errors=True)
+        os.makedirs(self.staging_dir(table_id))
+
+    def write(self, table_id: str, index: int, path: str) -> None:
+        shutil.move(path, os.path.join(self.staging_dir(table_id), f'chunk-{index:05d}.parquet'))
+
+    def finish(self, table_id: str) -> None:
+        table_dir = self.table_dir(table_id)
+        staging_dir = self.staging_dir(table_id)
+        if self._if_exists == 'replace' and os.path.isdir(table_dir):
+            # Swap whole directories; the old table is removed only afterwards
+            old_dir = f'{staging_dir}.old'
+            shutil.rmtree(old_dir, ignore_errors=True)
+            os.replace(table_dir, old_dir)
+            os.replace(staging_dir, table_dir)
+            shutil.rmtree(old_dir)
+            return
+        os.makedirs(table_dir, exist_ok=True)
+        offset = len([n for n in os.listdir(table_dir) if n.startswith('part-')])
+        for index, name in enumerate(sorted(os.listdir(staging_dir))):
+            os.replace(os.path.join(staging_dir, name), os.path.join(table_dir, f'part-{offset + index:05d}.parquet'))
+        os.rmdir(staging_dir)
+
+    def abort(self, table_id: str) -> None:
+        shutil.rmtree(self.staging_dir(table_id), ignore_errors=True)
+
+
+class BigQuerySink(ChunkSink):
+    """
+    Loads the chunks into a staging table, then copies it over the target.
+
+    The first chunk creates the staging table and is waited for; the rest
+    are appended with at most `max_pending_jobs` load jobs outstanding.
+    `finish` waits for every load and then runs a single copy job into the
+    target with the if_exists policy (WRITE_TRUNCATE, WRITE_APPEND or
+    WRITE_EMPTY). A copy job is atomic, so a failed chunk leaves the target
+    untouched. The staging table is deleted either way.
+    """
+
+    DISPOSITIONS = {
+        'replace': 'WRITE_TRUNCATE',
+        'append': 'WRITE_APPEND',
+        'fail': 'WRITE_EMPTY',
+    }
+
+    def __init__(self, client, max_pending_jobs: int = 4):
+        self.client = client
+        self.max_pending_jobs = max_pending_jobs
+        self._pending = []
+        self._if_exists = 'append'
+        self._staging_id = None
+
+    def begin(self, table_id: str, if_exists: str) -> None:
+        self._pending = []
+        self._if_exists = if_exists
+        self._staging_id = f'{table_id}__staging_{uuid.uuid4().hex[:12]}'
+
+    def write(self, table_id: str, index: int, path: str) -> None:
+        from google.cloud import bigquery
+
+        job_config = bigquery.LoadJobConfig(
+            source_format=bigquery.SourceFormat.PARQUET,
+            write_disposition='WRITE_TRUNCATE' if index == 0 else 'WRITE_APPEND',
+        )
+        with open(path, 'rb') as f:
+            job = self.client.load_table_from_file(f, self._staging_id, job_config=job_config)
+
+        if index == 0:
+            # Later appends must not race the table's creation
+            job.result()
+            return
+        self._pending.append(job)
+        while len(self._pending) > self.max_pending_jobs:
+            self._pending.pop(0).result()
+
+    def finish(self, table_id: str) -> None:
+        from google.cloud import bigquery
+
+        try:
+            while self._pending:
+                self._pending.pop(0).result()
+            job_config = bigquery.CopyJobConfig(write_disposition=self.DISPOSITIONS[self._if_exists])
+            self.client.copy_table(self._staging_id, table_id, job_config=job_config).result()
+        finally:
+            self.client.delete_table(self._staging_id, not_found_ok=True)
+
+    def abort(self, table_id: str) -> None:
+        for job in self._pending:
+            job.cancel()
+        self._pending = []
+        self.client.delete_table(self._staging_id, not_found_ok=True)
+
+
+def export_in_chunks(df: pd.DataFrame, table_id: str, sink: ChunkSink, if_exists: str = 'replace',
+                     chunk_rows: Optional[int] = None, chunk_bytes: int = CHUNK_BYTES,
+                     tmp_dir: Optional[str] = None) -> int:
+    """
+    Export `df` to `sink` as Parquet chunks of bounded size.
+
+    Chunks hold `chunk_rows` rows, or as many rows as fit in roughly
+    `chunk_bytes` of frame memory. Only one chunk is converted to Arrow at a
+    time, and all chunks share the schema inferred from the whole frame so
+    their column types agree. Returns the number of chunks written.
+    """
+    if chunk_rows is None:
+        row_bytes = max(1, int(df.memory_usage(index=False).sum()) // max(len(df), 1))
+        chunk_rows = max(1, chunk_bytes // row_bytes)
+
+    schema = pa.Schema.from_pandas(df, preserve_index=False)
+    n_chunks = 0
+
+    sink.begin(table_id, if_exists)
+    try:
+        with tempfile.TemporaryDirectory(dir=tmp_dir) as tmp:
+            # An empty frame still writes one chunk so the table gets its schema
+            for index, start in enumerate(range(0, max(len(df), 1), chunk_rows)):
+                table = pa.Table.from_pandas(
+                    df.iloc[start:start + chunk_rows], schema=schema, preserve_index=False
+                )
+                path = os.path.join(tmp, f'chunk-{index:05d}.parquet')
+                pq.write_table(table, path)
+                del table
+                sink.write(table_id, index, path)
+                n_chunks += 1
+    except BaseException:
+        sink.abort(table_id)
+        raise
+    sink.finish(table_id)
+
+    return n_chunks
+
+
+def export_chunked(df: pd.DataFrame, table_id: str, configuration: dict, bigquery_client,
+                   if_exists: str = 'replace') -> int:
+    """
+    Chunked export of a data exporter block, driven by its configuration.
+
+    Bounded-size Parquet chunks go to `local_sink_dir` when set, else to
+    BigQuery through a staging table. `bigquery_client` is called for the
+    client only in the latter case. `chunk_mb` and `max_pending_jobs` tune
+    the chunk size and the number of concurrent load jobs.
+    """
+    if configuration.get('local_sink_dir'):
+        sink = LocalDirectorySink(configuration['local_sink_dir'])
+    else:
+        sink = BigQuerySink(bigquery_client(), max_pending_jobs=configuration.get('max_pending_jobs', 4))
+    return export_in_chunks(
+        df,
+        table_id,
+        sink,
+        if_exists=if_exists,
+        chunk_bytes=configuration.get('chunk_mb', 256) * 2**20,
+    )
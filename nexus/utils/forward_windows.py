@@ -0,0 +1,189 @@
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+from typing import List, Tuple
+
+# Upper bound on window cells (rows x depth) materialised per chunk
+MAX_CHUNK_CELLS = 4_000_000
+
+
+def horizon_days(timeframes_months: List[int], trading_days_per_year: int) -> List[int]:
+    """Convert timeframes in months to forward window lengths in trading days."""
+    return [int(months * trading_days_per_year / 12) for months in timeframes_months]
+
+
+def group_bounds(keys) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Return (starts, stops) of the contiguous runs of equal keys.
+
+    `keys` must already be sorted so that every group is contiguous (e.g. a
+    panel sorted by ticker, then date). Rows with a null key are skipped,
+    matching `groupby` semantics.
+    """
+    codes, _ = pd.factorize(np.asarray(keys))
+    n = len(codes)
+    if n == 0:
+        empty = np.array([], dtype=np.int64)
+        return empty, empty
+
+    change = np.flatnonzero(codes[1:] != codes[:-1]) + 1
+    starts = np.concatenate(([0], change))
+    stops = np.concatenate((change, [n]))
+    valid = codes[starts] >= 0
+    return starts[valid], stops[valid]
+
+
+def forward_view(values: np.ndarray, depth: int) -> np.ndarray:
+    """
+    Return an (n, depth) read-only view where row i is values[i:i + depth].
+
+    Rows near the end are padded with NaN, which compares False against any
+    threshold, so truncated windows behave like the SAS `toploop` window.
+    """
+    padded = np.concatenate((values, np.full(depth - 1, np.nan)))
+    return sliding_window_view(padded, depth)
+
+
+def barrier_metrics(prices, barriers: List[float], horizons: List[int],
+                    max_chunk_cells: int = MAX_CHUNK_CELLS):
+    """
+    Forward barrier breach metrics for a single price series.
+
+    For each observation i and horizon h the window is prices[i:i + min(h, n - i)]
+    (current observation included). Every window is scanned once at the
+    longest horizon and cumulative sums along the window give the counts
+    and breach sums for every shorter horizon. Duplicate barrier levels are
+    computed once.
+
+    Parameters:
+    -----------
+    prices : array-like
+        Prices of one ticker in date order
+    barriers : List[float]
+        Barrier levels as fractions of the current price
+    horizons : List[int]
+        Forward window lengths in trading days
+
+    Returns:
+    --------
+    Tuple[np.ndarray, np.ndarray, np.ndarray]
+        pct_above with shape (horizons, n), pct_below and mean_bb_price with
+        shape (horizons, barriers, n). Horizons of zero days are left NaN.
+    """
+    prices = np.asarray(prices, dtype=np.float64)
+    horizons = np.asarray(horizons, dtype=np.int64)
+    levels, inverse = np.unique(np.asarray(barriers, dtype=np.float64), return_inverse=True)
+    n = len(prices)
+
+    pct_above = np.full((len(horizons), n), np.nan)
+    pct_below = np.full((len(horizons), len(levels), n), np.nan)
+    mean_below = np.full((len(horizons), len(levels), n), np.nan)
+
+    active = np.flatnonzero(horizons > 0)
+    if n == 0 or len(active) == 0:
+        return pct_above, pct_below[:, inverse], mean_below[:, inverse]
+
+    depth = int(min(horizons[active].max(), n))
+    last_col = np.minimum(horizons[active], depth) - 1
+    windows = forward_view(prices, depth)
+    chunk = max(1, max_chunk_cells // depth)
+
+    for lo in range(0, n, chunk):
+        hi = min(lo + chunk, n)
+        win = windows[lo:hi]
+        current = prices[lo:hi, None]
+        # Days actually available in each window: min(h, n - i)
+        total_days = np.minimum(horizons[active][:, None], n - np.arange(lo, hi))
+
+        # SAS semantics: days above compare against forward_prices[0]
+        days_above = np.cumsum(win >= current, axis=1)[:, last_col].T
+        pct_above[active, lo:hi] = days_above / total_days
+
+        for b, level in enumerate(levels):
+            below = win < current * level
+            days_below = np.cumsum(below, axis=1)[:, last_col].T
+            below_sum = np.cumsum(np.where(below, win, 0.0), axis=1)[:, last_col].T
+            pct_below[active, b, lo:hi] = days_below / total_days
+            with np.errstate(invalid='ignore', divide='ignore'):
+                mean_below[active, b, lo:hi] = np.where(
+                    days_below > 0, below_sum / days_below, np.nan
+                )
+
+    return pct_above, pct_below[:, inverse], mean_below[:, inverse]
+
+
+def segment_shifts(values: np.ndarray, missing: np.ndarray, lo: np.ndarray, length: int) -> np.ndarray:
+    """Mean of the non-missing values[lo:lo + length] for each segment start, 0 if none."""
+    filled = np.concatenate(([0.0], np.cumsum(np.where(missing, 0.0, values))))
+    present = np.concatenate(([0], np.cumsum(~missing)))
+    hi = np.minimum(lo + length, len(values))
+    count = present[hi] - present[lo]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where(count > 0, (filled[hi] - filled[lo]) / count, 0.0)
+
+
+def forward_std(values, windows: List[int], min_count: int = 3) -> np.ndarray:
+    """
+    Forward rolling sample standard deviation (ddof=1) for several windows.
+
+    The window for observation i is values[i:min(n, i + w)] and needs at least
+    `min_count` observations. Windows starting in the same block of w rows
+    span at most 2w - 1 values; each block is centred on the mean of those
+    values and its prefix sums of x and x**2 give every window in it, so a
+    horizon is O(n) and the cancellation depends on the local price level
+    only. Any window containing a NaN yields NaN, as np.std would.
+
+    Returns:
+    --------
+    np.ndarray
+        Array of shape (windows, n)
+    """
+    values = np.asarray(values, dtype=np.float64)
+    n = len(values)
+    out = np.full((len(windows), n), np.nan)
+    if n == 0:
+        return out
+
+    missing = np.isnan(values)
+    for k, window in enumerate(windows):
+        window = int(min(window, n))
+        if window < max(min_count, 1):
+            continue
+        # Row b, column j: values[b * window + j], NaN past the end
+        lo = np.arange(0, n, window)
+        length = 2 * window - 1
+        padded = np.concatenate((values, np.full(len(lo) * window + window - 1 - n, np.nan)))
+        block = padded[lo[:, None] + np.arange(length)]
+        block_missing = np.isnan(block)
+        centred = np.where(block_missing, 0.0, block - segment_shifts(values, missing, lo, length)[:, None])
+
+        # Sums from each column to the block end: a window cut short by the
+        # series end then sums only its own values
+        zero = np.zeros((len(lo), 1))
+        sum_x = np.concatenate((np.cumsum(centred[:, ::-1], axis=1)[:, ::-1], zero), axis=1)
+        sum_xx = np.concatenate((np.cumsum((centred * centred)[:, ::-1], axis=1)[:, ::-1], zero), axis=1)
+        n_missing = np.concatenate((np.cumsum(block_missing[:, ::-1], axis=1)[:, ::-1], zero), axis=1)
+
+        start = np.arange(window)
+        count = np.minimum(window, n - (lo[:, None] + start))
+        stop = start + np.maximum(count, 0)
+        rows = np.arange(len(lo))[:, None]
+        total = sum_x[rows, start] - sum_x[rows, stop]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            var = (sum_xx[rows, start] - sum_xx[rows, stop] - total * total / count) / (count - 1)
+        valid = (count >= min_count) & (n_missing[rows, stop] == n_missing[rows, start])
+        out[k] = np.where(valid, np.sqrt(np.maximum(var, 0.0)), np.nan).ravel()[:n]
+
+    return out
+
+
+def forward_weights(remaining, horizons: List[int]) -> np.ndarray:
+    """
+    Share of each forward window that is available: min(h, remaining) / h.
+
+    `remaining` is the number of observations from each row to the end of its
+    series, current row included. Returns an array of shape (n, horizons).
+    """
+    horizons = np.asarray(horizons, dtype=np.float64)
+    remaining = np.asarray(remaining, dtype=np.float64)
+    return np.minimum(horizons, remaining[:, None]) / horizons
@@ -0,0 +1,70 @@
+import os
+from typing import List, Optional
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+# Column of the one-row frame that stands in for a stored block output
+REFERENCE_COLUMN = 'frame_store_path'
+
+FORMATS = {'arrow': '.arrow', 'parquet': '.parquet'}
+
+
+def store_frame(df: pd.DataFrame, root: str, name: str, format: str = 'arrow') -> pd.DataFrame:
+    """
+    Write a block output under `root` and return a reference to it.
+
+    'arrow' writes an uncompressed Arrow IPC file, which readers memory-map
+    and convert without copying numeric and date columns. 'parquet' is
+    smaller on disk but is decoded on every read. The returned one-row
+    frame holds the path, row count and file modification time; returning it
+    from a block keeps Mage's own variable serialization down to that row,
+    and downstream blocks pass what they receive to `open_frame`.
+    """
+    if format not in FORMATS:
+        raise ValueError(f"format must be one of {list(FORMATS)}, got {format!r}")
+    os.makedirs(root, exist_ok=True)
+    path = os.path.join(root, f'{name}{FORMATS[format]}')
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    if format == 'arrow':
+        with pa.OSFile(f'{path}.tmp', 'wb') as sink, pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    else:
+        pq.write_table(table, f'{path}.tmp')
+    os.replace(f'{path}.tmp', path)
+    # The modification time changes with every write, so caches keyed on
+    # the reference (see nexus.utils.block_cache) never see stale contents
+    return pd.DataFrame({
+        REFERENCE_COLUMN: [path],
+        'rows': [len(df)],
+        'modified_ns': [os.stat(path).st_mtime_ns],
+    })
+
+
+def is_reference(df: pd.DataFrame) -> bool:
+    return REFERENCE_COLUMN in df.columns and len(df) == 1
+
+
+def open_frame(df: pd.DataFrame, columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """
+    Resolve an upstream block output to a DataFrame of `columns` (all if None).
+
+    A reference from `store_frame` is opened memory-mapped and only the
+    requested columns are read; a regular frame is returned as is, projected
+    to `columns`, so blocks work whether or not the upstream stores its
+    output.
+    """
+    if not is_reference(df):
+        return df[columns] if columns else df
+    path = df[REFERENCE_COLUMN].iloc[0]
+    if path.endswith(FORMATS['parquet']):
+        table = pq.read_table(path, columns=columns, memory_map=True)
+    else:
+        with pa.memory_map(path) as source:
+            table = pa.ipc.open_file(source).read_all()
+        if columns:
+            table = table.select(columns)
+    # split_blocks keeps each column its own block, so columns without
+    # nulls stay views of the mapped file instead of being consolidated
+    return table.to_pandas(split_blocks=True)
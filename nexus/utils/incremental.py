@@ -0,0 +1,102 @@
+import os
+from typing import Dict, List, NamedTuple, Optional
+
+import numpy as np
+import pandas as pd
+
+
+class IncrementalPlan(NamedTuple):
+    # First row per group that has to be recomputed
+    compute_starts: np.ndarray
+    # Rows whose features are copied from the previous table, and their
+    # positions in it
+    reuse_rows: np.ndarray
+    reuse_from: np.ndarray
+
+
+def fingerprint_path(path: str) -> str:
+    return f'{path}.fingerprint'
+
+
+def read_previous(path: Optional[str], columns: List[str], key: List[str] = ['ticker', 'date'],
+                  fingerprint: Optional[str] = None) -> Optional[pd.DataFrame]:
+    """
+    Previously computed feature table at `path`, unique by `key`, or None when
+    there is none, it lacks any of `columns`, or it was written with a
+    different `fingerprint` (e.g. after the barrier levels changed, which
+    leaves the column names alone).
+    """
+    if not path or not os.path.exists(path):
+        return None
+    if fingerprint is not None:
+        stored = None
+        if os.path.exists(fingerprint_path(path)):
+            with open(fingerprint_path(path)) as f:
+                stored = f.read().strip()
+        if stored != fingerprint:
+            return None
+    previous = pd.read_parquet(path)
+    if not set(columns).issubset(previous.columns):
+        return None
+    return previous.drop_duplicates(subset=key, keep='last').reset_index(drop=True)
+
+
+def write_previous(df: pd.DataFrame, path: Optional[str], fingerprint: Optional[str] = None) -> None:
+    """Write the feature table to `path`, with `fingerprint` in a file next to it."""
+    if not path:
+        return
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    # Drop the old fingerprint first so an interrupted write never pairs the
+    # new table with the configuration of the old one
+    if os.path.exists(fingerprint_path(path)):
+        os.remove(fingerprint_path(path))
+    df.to_parquet(f'{path}.tmp', index=False)
+    os.replace(f'{path}.tmp', path)
+    if fingerprint is not None:
+        with open(f'{fingerprint_path(path)}.tmp', 'w') as f:
+            f.write(fingerprint)
+        os.replace(f'{fingerprint_path(path)}.tmp', fingerprint_path(path))
+
+
+def plan_incremental(df_sorted: pd.DataFrame, previous: pd.DataFrame, starts: np.ndarray,
+                     stops: np.ndarray, depth: int, key: List[str] = ['ticker', 'date'],
+                     value_col: str = 'adj_close') -> IncrementalPlan:
+    """
+    Work out which rows of a sorted panel can reuse previous forward features.
+
+    A row's forward features depend only on the next `depth` rows of its
+    group. A row is reusable when every row of that window was already in
+    `previous` with the same `value_col`, so appended days only invalidate
+    the last `depth - 1` previously known rows of each ticker, while a
+    restated price invalidates everything up to it. `previous` must be
+    unique by `key`.
+    """
+    if previous.empty:
+        return IncrementalPlan(np.array(starts, copy=True), np.array([], dtype=np.int64), np.array([], dtype=np.int64))
+
+    previous_index = pd.MultiIndex.from_frame(previous[key])
+    matched = previous_index.get_indexer(pd.MultiIndex.from_frame(df_sorted[key]))
+
+    known = matched >= 0
+    current = df_sorted[value_col].to_numpy(dtype=np.float64)
+    before = previous[value_col].to_numpy(dtype=np.float64)[np.where(known, matched, 0)]
+    known &= (current == before) | (np.isnan(current) & np.isnan(before))
+
+    compute_starts = np.array(starts, copy=True)
+    reuse_rows = []
+    for g, (start, stop) in enumerate(zip(starts, stops)):
+        # Length of the leading run of known rows in this group
+        unknown = np.flatnonzero(~known[start:stop])
+        n_known = unknown[0] if len(unknown) else stop - start
+        n_reuse = max(0, n_known - depth + 1)
+        compute_starts[g] = start + n_reuse
+        reuse_rows.append(np.arange(start, start + n_reuse))
+
+    reuse_rows = np.concatenate(reuse_rows) if reuse_rows else np.array([], dtype=np.int64)
+    return IncrementalPlan(compute_starts, reuse_rows, matched[reuse_rows])
+
+
+def fill_reused(result_cols: Dict[str, np.ndarray], previous: pd.DataFrame, plan: IncrementalPlan) -> None:
+    """Copy reused rows of every result column from `previous` in place."""
+    for col, values in result_cols.items():
+        values[plan.reuse_rows] = previous[col].to_numpy()[plan.reuse_from]
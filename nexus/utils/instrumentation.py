@@ -0,0 +1,218 @@
+import contextvars
+import functools
+import json
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Optional
+
+import pandas as pd
+
+from nexus.utils.frame_store import is_reference
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Minimum seconds between two progress lines of the same loop
+PROGRESS_INTERVAL = 10.0
+
+# JSON lines file of the running block; None writes to stdout (Mage's log)
+_sink = contextvars.ContextVar('nexus_metrics_sink', default=None)
+_span = contextvars.ContextVar('nexus_metrics_span', default=None)
+_write_lock = threading.Lock()
+
+
+def _json_default(value):
+    # numpy scalars, timestamps and anything else printable
+    return value.item() if hasattr(value, 'item') else str(value)
+
+
+def emit(event: str, sink: Optional[str] = None, **fields) -> None:
+    """Write one JSON line {"ts", "event", **fields} to `sink` or the running block's sink."""
+    record = {'ts': datetime.now(timezone.utc).isoformat(timespec='milliseconds'), 'event': event, **fields}
+    line = json.dumps(record, default=_json_default)
+    sink = sink or _sink.get()
+    with _write_lock:
+        if sink is None:
+            print(line, flush=True)
+        else:
+            with open(sink, 'a') as f:
+                f.write(line + '\n')
+
+
+def max_rss_mb() -> Optional[float]:
+    """Peak resident memory of this process so far, in MiB."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return round(peak / (2**20 if sys.platform == 'darwin' else 2**10), 1)
+
+
+def frame_rows(value) -> Optional[int]:
+    """Rows of a DataFrame, of a stored frame reference, or summed over a list of frames."""
+    if isinstance(value, pd.DataFrame):
+        if is_reference(value):
+            return int(value['rows'].iloc[0])
+        return len(value)
+    if isinstance(value, (list, tuple)):
+        rows = [frame_rows(v) for v in value]
+        return sum(r for r in rows if r is not None) if any(r is not None for r in rows) else None
+    return None
+
+
+class Span:
+    """
+    Wall time, CPU time and peak memory of one block run or one phase of it.
+
+    Used as a context manager; on exit it emits a 'block' or 'phase' line
+    with the measurements, `status` ('ok' or the exception type) and any
+    fields added with `set` or `count`. CPU time is the whole process's, so
+    it includes worker threads. `max_rss_mb` is the process high-water mark
+    at exit, so it only says something when it grew during the span.
+    """
+
+    def __init__(self, block: str, phase: Optional[str] = None, **fields):
+        self.block = block
+        self.phase = phase
+        self.fields = dict(fields)
+        self._sink = _sink.get()
+        self._lock = threading.Lock()
+        self._token = None
+
+    def set(self, **fields) -> None:
+        with self._lock:
+            self.fields.update(fields)
+
+    def count(self, name: str, n: int = 1) -> None:
+        """Add `n` to counter `name`; safe to call from worker threads."""
+        with self._lock:
+            self.fields[name] = self.fields.get(name, 0) + n
+
+    def __enter__(self):
+        self._token = _span.set(self)
+        self._rss_start = max_rss_mb()
+        self._cpu = time.process_time()
+        self._wall = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        wall = time.perf_counter() - self._wall
+        cpu = time.process_time() - self._cpu
+        _span.reset(self._token)
+        record = {'block': self.block}
+        if self.phase is not None:
+            record['phase'] = self.phase
+        rss = max_rss_mb()
+        record.update(
+            status='ok' if exc_type is None else exc_type.__name__,
+            wall_s=round(wall, 4),
+            cpu_s=round(cpu, 4),
+            max_rss_mb=rss,
+            rss_growth_mb=None if rss is None else round(rss - self._rss_start, 1),
+        )
+        record.update(self.fields)
+        emit('phase' if self.phase is not None else 'block', sink=self._sink, **record)
+        return False
+
+
+def current_span() -> Optional[Span]:
+    return _span.get()
+
+
+def phase(name: str, **fields) -> Span:
+    """Span for a phase of the running block (use as `with phase('download') as p:`)."""
+    parent = _span.get()
+    return Span(parent.block if parent is not None else None, phase=name, **fields)
+
+
+def record(**fields) -> None:
+    """Set fields on the innermost running span; a no-op outside one."""
+    span = _span.get()
+    if span is not None:
+        span.set(**fields)
+
+
+def count(name: str, n: int = 1) -> None:
+    """Add to a counter on the innermost running span; a no-op outside one."""
+    span = _span.get()
+    if span is not None:
+        span.count(name, n)
+
+
+def submit(executor, function, *args, **kwargs):
+    """
+    `executor.submit` that runs `function` in a copy of the caller's context.
+
+    Pool threads do not inherit context variables, so events, records and
+    counts from a worker would otherwise miss the running block's
+    `metrics_path` and span.
+    """
+    return executor.submit(contextvars.copy_context().run, function, *args, **kwargs)
+
+
+def instrumented(function):
+    """
+    Measure a Mage block function as one Span named after it.
+
+    Place it directly under the Mage decorator. Rows in (all positional
+    DataFrame inputs) and rows out are recorded with the timings. The
+    block's `metrics_path` configuration, when set, sends its JSON lines to
+    that file instead of stdout.
+    """
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        configuration = kwargs.get('configuration') or {}
+        token = _sink.set(configuration.get('metrics_path'))
+        try:
+            with Span(function.__name__, rows_in=frame_rows(list(args))) as span:
+                output = function(*args, **kwargs)
+                span.set(rows_out=frame_rows(output))
+            return output
+        finally:
+            _sink.reset(token)
+
+    return wrapper
+
+
+class Progress:
+    """
+    Rate-limited progress of a loop, in place of a line per item.
+
+    `update` may be called from any thread. A 'progress' line with the
+    count, rate and estimated time left is emitted at most every `interval`
+    seconds, and once more when `total` is reached.
+    """
+
+    def __init__(self, label: str, total: Optional[int] = None, interval: float = PROGRESS_INTERVAL,
+                 clock=time.monotonic):
+        span = _span.get()
+        self.block = span.block if span is not None else None
+        self.label = label
+        self.total = total
+        self.interval = interval
+        self.done = 0
+        self._clock = clock
+        self._sink = _sink.get()
+        self._start = clock()
+        self._last = self._start
+        self._lock = threading.Lock()
+
+    def update(self, n: int = 1, **fields) -> None:
+        with self._lock:
+            self.done += n
+            now = self._clock()
+            finished = self.total is not None and self.done >= self.total
+            if not finished and now - self._last < self.interval:
+                return
+            self._last = now
+            done, elapsed = self.done, now - self._start
+        rate = done / elapsed if elapsed > 0 else None
+        eta = (self.total - done) / rate if rate and self.total is not None else None
+        emit(
+            'progress', sink=self._sink, block=self.block, label=self.label, done=done, total=self.total,
+            per_s=round(rate, 2) if rate else None, eta_s=round(eta, 1) if eta is not None else None, **fields,
+        )
@@ -0,0 +1,57 @@
+import importlib
+from typing import Callable, List, NamedTuple, Optional
+
+from nexus.utils.instrumentation import emit
+
+# Backend name: module providing barrier_metrics, forward_std and forward_weights
+# with the contracts of nexus.utils.forward_windows
+BACKEND_MODULES = {
+    'numpy': 'nexus.utils.forward_windows',
+    'numba': 'nexus.utils.kernels_numba',
+    'polars': 'nexus.utils.kernels_polars',
+}
+
+DEFAULT_BACKEND = 'numpy'
+
+
+class Backend(NamedTuple):
+    name: str
+    barrier_metrics: Callable
+    forward_std: Callable
+    forward_weights: Callable
+
+
+def get_backend(name: Optional[str] = None, fallback: bool = True) -> Backend:
+    """
+    Forward-window kernels of the named backend ('numpy', 'numba' or 'polars').
+
+    The 'polars' backend only replaces forward_std; its barrier_metrics and
+    forward_weights are the NumPy kernels. The optional backends need their
+    library installed. When it is missing the NumPy kernels are returned
+    instead, or ImportError is raised if `fallback` is False. Kernel
+    functions are module-level, so they can be handed to `run_grouped`
+    worker processes.
+    """
+    name = name or DEFAULT_BACKEND
+    if name not in BACKEND_MODULES:
+        raise ValueError(f"Unknown backend {name}; expected one of {list(BACKEND_MODULES)}")
+    try:
+        module = importlib.import_module(BACKEND_MODULES[name])
+    except ImportError as e:
+        if not fallback:
+            raise
+        emit('warning', message=f"Backend {name} is unavailable, using {DEFAULT_BACKEND}", error=str(e))
+        return get_backend(DEFAULT_BACKEND)
+    return Backend(name, module.barrier_metrics, module.forward_std, module.forward_weights)
+
+
+def available_backends() -> List[str]:
+    """Backends whose library is installed here."""
+    available = []
+    for name in BACKEND_MODULES:
+        try:
+            get_backend(name, fallback=False)
+        except ImportError:
+            continue
+        available.append(name)
+    return available
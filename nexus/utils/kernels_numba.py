@@ -0,0 +1,111 @@
+# Numba versions of the forward-window kernels. Importing this module requires
+# numba; the loops follow the NumPy kernels' summation order.
+from typing import List
+
+import numba
+import numpy as np
+
+from nexus.utils.forward_windows import forward_weights
+
+
+@numba.njit(cache=True, nogil=True)
+def _barrier_loop(prices, levels, horizons, order, pct_above, pct_below, mean_below):
+    n = len(prices)
+    n_levels = len(levels)
+    days_below = np.zeros(n_levels, dtype=np.int64)
+    below_sum = np.zeros(n_levels)
+    for i in range(n):
+        current = prices[i]
+        days_above = 0
+        days_below[:] = 0
+        below_sum[:] = 0.0
+        j = 0
+        # Horizons in increasing length, so the window is scanned once
+        for k in order:
+            if horizons[k] <= 0:
+                continue
+            end = min(horizons[k], n - i)
+            while j < end:
+                x = prices[i + j]
+                if x >= current:
+                    days_above += 1
+                for b in range(n_levels):
+                    if x < current * levels[b]:
+                        days_below[b] += 1
+                        below_sum[b] += x
+                j += 1
+            pct_above[k, i] = days_above / end
+            for b in range(n_levels):
+                pct_below[k, b, i] = days_below[b] / end
+                if days_below[b] > 0:
+                    mean_below[k, b, i] = below_sum[b] / days_below[b]
+
+
+def barrier_metrics(prices, barriers: List[float], horizons: List[int], max_chunk_cells: int = None):
+    """Same contract as `nexus.utils.forward_windows.barrier_metrics`."""
+    prices = np.ascontiguousarray(prices, dtype=np.float64)
+    horizons = np.asarray(horizons, dtype=np.int64)
+    levels, inverse = np.unique(np.asarray(barriers, dtype=np.float64), return_inverse=True)
+    n = len(prices)
+
+    pct_above = np.full((len(horizons), n), np.nan)
+    pct_below = np.full((len(horizons), len(levels), n), np.nan)
+    mean_below = np.full((len(horizons), len(levels), n), np.nan)
+    _barrier_loop(prices, levels, horizons, np.argsort(horizons, kind='stable'),
+                  pct_above, pct_below, mean_below)
+
+    return pct_above, pct_below[:, inverse], mean_below[:, inverse]
+
+
+@numba.njit(cache=True, nogil=True)
+def _std_loop(values, windows, min_count, out):
+    n = len(values)
+    for k in range(len(windows)):
+        window = min(windows[k], n)
+        if window < max(min_count, 1):
+            continue
+        length = 2 * window - 1
+        sum_x = np.zeros(length + 1)
+        sum_xx = np.zeros(length + 1)
+        n_missing = np.zeros(length + 1, dtype=np.int64)
+        for lo in range(0, n, window):
+            # Block of the windows starting in lo..lo + window - 1, centred on its mean
+            hi = min(lo + length, n)
+            total = 0.0
+            present = 0
+            for i in range(lo, hi):
+                if not np.isnan(values[i]):
+                    total += values[i]
+                    present += 1
+            shift = total / present if present > 0 else 0.0
+            # Sums from each position to the block end
+            sum_x[hi - lo] = 0.0
+            sum_xx[hi - lo] = 0.0
+            n_missing[hi - lo] = 0
+            for j in range(hi - lo - 1, -1, -1):
+                x = values[lo + j]
+                missing = np.isnan(x)
+                centred = 0.0 if missing else x - shift
+                sum_x[j] = sum_x[j + 1] + centred
+                sum_xx[j] = sum_xx[j + 1] + centred * centred
+                n_missing[j] = n_missing[j + 1] + (1 if missing else 0)
+            for j in range(min(window, n - lo)):
+                count = min(window, n - lo - j)
+                stop = j + count
+                if count < min_count or n_missing[stop] != n_missing[j]:
+                    continue
+                total = sum_x[j] - sum_x[stop]
+                var = (sum_xx[j] - sum_xx[stop] - total * total / count) / (count - 1)
+                out[k, lo + j] = np.sqrt(max(var, 0.0))
+
+
+def forward_std(values, windows: List[int], min_count: int = 3) -> np.ndarray:
+    """Same contract as `nexus.utils.forward_windows.forward_std`."""
+    values = np.ascontiguousarray(values, dtype=np.float64)
+    out = np.full((len(windows), len(values)), np.nan)
+    if len(values) == 0:
+        return out
+
+    # Same blocks and centring as the NumPy kernel
+    _std_loop(values, np.asarray(windows, dtype=np.int64), min_count, out)
+    return out
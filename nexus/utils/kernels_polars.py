@@ -0,0 +1,36 @@
+# Polars versions of the forward-window kernels. Importing this module requires
+# polars. Only forward_std is Polars code: barrier metrics compare every window
+# against its first price, which is not a rolling aggregation, and the forward
+# weights are one broadcast division, so both are the NumPy kernels re-exported.
+import inspect
+from typing import List
+
+import numpy as np
+import polars as pl
+
+from nexus.utils.forward_windows import barrier_metrics, forward_weights
+
+# Polars 1.21 renamed rolling_* min_periods to min_samples
+MIN_SAMPLES = 'min_samples' if 'min_samples' in inspect.signature(pl.Series.rolling_std).parameters else 'min_periods'
+
+
+def forward_std(values, windows: List[int], min_count: int = 3) -> np.ndarray:
+    """
+    Same contract as `nexus.utils.forward_windows.forward_std`.
+
+    A forward window is a trailing window of the reversed series, so each
+    horizon is one Polars rolling_std. NaN propagates through the window as
+    in the NumPy kernel.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    out = np.full((len(windows), len(values)), np.nan)
+    if len(values) == 0:
+        return out
+
+    reversed_values = pl.Series(values[::-1].copy())
+    for k, window in enumerate(windows):
+        if window < min_count:
+            continue
+        std = reversed_values.rolling_std(window_size=window, ddof=1, **{MIN_SAMPLES: min_count})
+        out[k] = std.to_numpy()[::-1]
+    return out
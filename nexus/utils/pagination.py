@@ -0,0 +1,37 @@
+import concurrent.futures
+from typing import Any, Callable, Iterator
+
+from nexus.utils.instrumentation import submit
+
+
+def iter_pages(fetch_page: Callable[[str], Any], prefetch: bool = True) -> Iterator[Any]:
+    """
+    Yield the responses of an endpoint paginated by a `next_page` token.
+
+    `fetch_page(token)` returns a response with a `next_page` attribute; the
+    first page is requested with ''. With `prefetch`, a background thread
+    requests page k + 1 as soon as page k arrives, so the request is in
+    flight while the caller converts page k. Without it, each page is
+    requested only when the caller asks for it.
+
+    An exception from `fetch_page` is raised from the iterator at the page
+    that failed, after every earlier page has been yielded.
+    """
+    if not prefetch:
+        next_page = ''
+        while True:
+            response = fetch_page(next_page)
+            yield response
+            next_page = response.next_page
+            if not next_page:
+                return
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
+        pending = submit(executor, fetch_page, '')
+        while True:
+            response = pending.result()
+            if response.next_page:
+                pending = submit(executor, fetch_page, response.next_page)
+            yield response
+            if not response.next_page:
+                return
@@ -0,0 +1,168 @@
+import json
+import os
+import shutil
+from typing import Dict, Iterable, List, Optional
+from urllib.parse import quote, unquote
+
+import pandas as pd
+
+from nexus.utils.columnar import ID_FIELDS
+
+
+def plain(df: pd.DataFrame) -> pd.DataFrame:
+    """`df` with categorical columns as their plain values."""
+    categorical = [c for c in df.columns if isinstance(df[c].dtype, pd.CategoricalDtype)]
+    if not categorical:
+        return df
+    return df.astype({c: df[c].cat.categories.dtype for c in categorical})
+
+
+def categorize(df: pd.DataFrame) -> pd.DataFrame:
+    """`df` with its identifier columns (ID_FIELDS) as categoricals."""
+    ids = [c for c in ID_FIELDS if c in df.columns and not isinstance(df[c].dtype, pd.CategoricalDtype)]
+    return df.astype({c: 'category' for c in ids}) if ids else df
+
+
+class PriceStore:
+    """
+    Local Parquet store of EOD prices, partitioned by ticker.
+
+    Layout:
+        <root>/ticker=<TICKER>/part-000000.parquet, part-000001.parquet, ...
+        <root>/_high_water_marks.json   {ticker: last stored date}
+
+    Each append writes a new part file; rows are de-duplicated by date on
+    read with later parts winning, so re-fetched days overwrite older ones.
+    A ticker's parts are compacted into one file once there are more than
+    `max_parts` of them. Identifier columns are stored as plain strings, so
+    parts do not carry the category dictionary of the run that wrote them,
+    and are categorical again in what `read` and `read_ticker` return.
+    """
+
+    MANIFEST = '_high_water_marks.json'
+
+    def __init__(self, root: str, date_column: str = 'date', max_parts: int = 32):
+        self.root = root
+        self.date_column = date_column
+        self.max_parts = max_parts
+        os.makedirs(root, exist_ok=True)
+        self._marks = self._read_manifest()
+
+    def _read_manifest(self) -> Dict[str, str]:
+        path = os.path.join(self.root, self.MANIFEST)
+        if not os.path.exists(path):
+            return {}
+        with open(path) as f:
+            return json.load(f)
+
+    def _write_manifest(self) -> None:
+        path = os.path.join(self.root, self.MANIFEST)
+        tmp_path = f'{path}.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(self._marks, f, indent=0, sort_keys=True)
+        os.replace(tmp_path, path)
+
+    def _ticker_dir(self, ticker: str) -> str:
+        return os.path.join(self.root, f"ticker={quote(str(ticker), safe='')}")
+
+    def _parts(self, ticker: str) -> List[str]:
+        ticker_dir = self._ticker_dir(ticker)
+        if not os.path.isdir(ticker_dir):
+            return []
+        names = sorted(n for n in os.listdir(ticker_dir) if n.startswith('part-') and n.endswith('.parquet'))
+        return [os.path.join(ticker_dir, n) for n in names]
+
+    def _write_part(self, ticker: str, df: pd.DataFrame) -> None:
+        parts = self._parts(ticker)
+        seq = int(os.path.basename(parts[-1])[5:11]) + 1 if parts else 0
+        ticker_dir = self._ticker_dir(ticker)
+        os.makedirs(ticker_dir, exist_ok=True)
+        path = os.path.join(ticker_dir, f'part-{seq:06d}.parquet')
+        plain(df).to_parquet(f'{path}.tmp', index=False)
+        os.replace(f'{path}.tmp', path)
+
+    def _normalize(self, df: pd.DataFrame) -> pd.DataFrame:
+        df = df.copy()
+        df[self.date_column] = pd.to_datetime(df[self.date_column])
+        return df.sort_values(self.date_column).reset_index(drop=True)
+
+    def _update_mark(self, ticker: str, df: pd.DataFrame) -> None:
+        if df.empty:
+            return
+        last = df[self.date_column].max().strftime('%Y-%m-%d')
+        self._marks[ticker] = max(self._marks.get(ticker, last), last)
+
+    def tickers(self) -> List[str]:
+        return sorted(
+            unquote(n[len('ticker='):]) for n in os.listdir(self.root) if n.startswith('ticker=')
+        )
+
+    def high_water_marks(self) -> Dict[str, pd.Timestamp]:
+        """Last stored date for every ticker."""
+        return {ticker: pd.Timestamp(date) for ticker, date in self._marks.items()}
+
+    def last_date(self, ticker: str) -> Optional[pd.Timestamp]:
+        date = self._marks.get(ticker)
+        return pd.Timestamp(date) if date else None
+
+    def append(self, ticker: str, df: pd.DataFrame) -> None:
+        """Add rows for `ticker`; rows for already stored dates replace them."""
+        if df.empty:
+            return
+        df = self._normalize(df)
+        self._write_part(ticker, df)
+        self._update_mark(ticker, df)
+        self._write_manifest()
+        if len(self._parts(ticker)) > self.max_parts:
+            self.compact(ticker)
+
+    def replace(self, ticker: str, df: pd.DataFrame) -> None:
+        """Replace the whole history of `ticker`, e.g. after restated adj_* prices."""
+        shutil.rmtree(self._ticker_dir(ticker), ignore_errors=True)
+        self._marks.pop(ticker, None)
+        if not df.empty:
+            df = self._normalize(df)
+            self._write_part(ticker, df)
+            self._update_mark(ticker, df)
+        self._write_manifest()
+
+    def compact(self, ticker: str) -> None:
+        """Rewrite all parts of `ticker` as a single de-duplicated file."""
+        parts = self._parts(ticker)
+        if len(parts) <= 1:
+            return
+        df = self._read_parts(ticker)
+        ticker_dir = self._ticker_dir(ticker)
+        path = os.path.join(ticker_dir, 'compact.parquet.tmp')
+        plain(df).to_parquet(path, index=False)
+        for part in parts:
+            os.remove(part)
+        os.replace(path, os.path.join(ticker_dir, 'part-000000.parquet'))
+
+    def read_ticker(self, ticker: str, start_date=None, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        return categorize(self._read_parts(ticker, start_date, columns))
+
+    def _read_parts(self, ticker: str, start_date=None, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        parts = self._parts(ticker)
+        if not parts:
+            return pd.DataFrame(columns=columns)
+        read_columns = None if columns is None else list(dict.fromkeys([self.date_column, *columns]))
+        df = pd.concat([pd.read_parquet(p, columns=read_columns) for p in parts], ignore_index=True)
+        if len(parts) > 1:
+            df = df.drop_duplicates(subset=self.date_column, keep='last')
+            df = df.sort_values(self.date_column)
+        if start_date is not None:
+            df = df[df[self.date_column] >= pd.Timestamp(start_date)]
+        df = df.reset_index(drop=True)
+        return df if columns is None else df[columns]
+
+    def read(self, tickers: Optional[Iterable[str]] = None, start_date=None,
+             columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """Stored prices for `tickers` (default: all), in ticker then date order."""
+        tickers = self.tickers() if tickers is None else list(tickers)
+        frames = [self._read_parts(t, start_date, columns) for t in sorted(set(tickers))]
+        frames = [f for f in frames if not f.empty]
+        if not frames:
+            return pd.DataFrame(columns=columns)
+        # Categorized once over all tickers, not per ticker
+        return categorize(pd.concat(frames, ignore_index=True))
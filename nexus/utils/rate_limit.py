@@ -0,0 +1,248 @@
+import email.utils
+import random
+import threading
+import time
+from typing import Optional, Tuple
+
+from nexus.utils.instrumentation import count
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket rate limiter.
+
+    Tokens refill continuously at `rate` per second up to `capacity`; each
+    request takes one token and blocks until one is available. The clock and
+    sleep functions are injectable so the limiter can be exercised without
+    waiting in real time.
+    """
+
+    def __init__(self, rate: float, capacity: float = None, clock=time.monotonic, sleep=time.sleep):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = float(rate)
+        self.capacity = float(capacity) if capacity else max(1.0, self.rate)
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = self.capacity
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_acquire(self, tokens: float = 1.0) -> bool:
+        """Take `tokens` if available without blocking."""
+        with self._lock:
+            self._refill()
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return True
+            return False
+
+    def acquire(self, tokens: float = 1.0) -> None:
+        """Block until `tokens` are available, then take them."""
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+                wait = (tokens - self._tokens) / self.rate
+            self._sleep(wait)
+
+
+# HTTP statuses worth retrying; 429 also signals that concurrency is too high
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+THROTTLE_STATUS = 429
+
+
+def parse_retry_after(value, now: float = None) -> Optional[float]:
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP date)."""
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        pass
+    try:
+        when = email.utils.parsedate_to_datetime(str(value))
+    except (TypeError, ValueError):
+        return None
+    now = time.time() if now is None else now
+    return max(0.0, when.timestamp() - now)
+
+
+def classify_error(exc: BaseException) -> Optional[Tuple[bool, Optional[float]]]:
+    """
+    Decide whether a failed request is retried.
+
+    Returns None for errors that are not retried, else (throttled,
+    retry_after). Understands exceptions carrying an HTTP status as `status`
+    (Intrinio's ApiException) or `code` (urllib's HTTPError) with their
+    `headers`, fredapi's ValueError for FRED's rate-limit message, and
+    connection errors.
+    """
+    status = getattr(exc, 'status', None) or getattr(exc, 'code', None)
+    if isinstance(status, int):
+        if status not in RETRY_STATUSES:
+            return None
+        headers = getattr(exc, 'headers', None) or {}
+        return status == THROTTLE_STATUS, parse_retry_after(headers.get('Retry-After'))
+    # fredapi turns HTTP errors into ValueError(<FRED error message>)
+    if isinstance(exc, ValueError) and 'too many requests' in str(exc).lower():
+        return True, None
+    if isinstance(exc, (ConnectionError, TimeoutError)):
+        return False, None
+    return None
+
+
+class RequestGovernor:
+    """
+    Shared throttle for calls to a rate-limited API from many threads.
+
+    Concurrency adapts AIMD-style: the in-flight limit grows by about one
+    per limit's worth of successful calls and is multiplied by `decrease`
+    on a 429, or when the smoothed latency exceeds `latency_target`, at most
+    once per `cooldown` seconds. Failed calls that `classify` deems
+    retryable are retried up to `max_retries` times after a full-jitter
+    exponential backoff, or after the server's Retry-After, which also
+    pauses every other caller. An optional TokenBucket caps the request
+    rate on top. The clock, sleep and random functions are injectable like
+    TokenBucket's.
+    """
+
+    def __init__(self, initial_limit: float = 4, min_limit: float = 1, max_limit: float = 32,
+                 decrease: float = 0.5, latency_target: float = None, cooldown: float = 1.0,
+                 max_retries: int = 5, base_delay: float = 0.5, max_delay: float = 60.0,
+                 rate_limiter: TokenBucket = None, classify=classify_error,
+                 clock=time.monotonic, sleep=time.sleep, random=random.random):
+        if not 0 < min_limit <= initial_limit <= max_limit:
+            raise ValueError("limits must satisfy 0 < min_limit <= initial_limit <= max_limit")
+        self.limit = float(initial_limit)
+        self.min_limit = float(min_limit)
+        self.max_limit = float(max_limit)
+        self.decrease = decrease
+        self.latency_target = latency_target
+        self.cooldown = cooldown
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.rate_limiter = rate_limiter
+        self._classify = classify
+        self._clock = clock
+        self._sleep = sleep
+        self._random = random
+        self._in_flight = 0
+        self._paused_until = 0.0
+        self._last_decrease = float('-inf')
+        self._latency = None
+        self._condition = threading.Condition()
+        # Counters for logging and benchmarks
+        self.calls = 0
+        self.throttled = 0
+        self.retries = 0
+
+    def _acquire_slot(self) -> None:
+        with self._condition:
+            while True:
+                wait = self._paused_until - self._clock()
+                if wait <= 0 and self._in_flight < int(self.limit):
+                    self._in_flight += 1
+                    self.calls += 1
+                    return
+                if wait > 0:
+                    # Sit out a Retry-After pause without holding the lock
+                    self._condition.release()
+                    try:
+                        self._sleep(wait)
+                    finally:
+                        self._condition.acquire()
+                else:
+                    self._condition.wait()
+
+    def _release_slot(self) -> None:
+        with self._condition:
+            self._in_flight -= 1
+            self._condition.notify_all()
+
+    def _decrease(self) -> None:
+        # Caller holds the lock; one decrease per congestion event
+        now = self._clock()
+        if now - self._last_decrease >= self.cooldown:
+            self.limit = max(self.min_limit, self.limit * self.decrease)
+            self._last_decrease = now
+
+    def _on_success(self, latency: float) -> None:
+        with self._condition:
+            self._latency = latency if self._latency is None else 0.8 * self._latency + 0.2 * latency
+            if self.latency_target is not None and self._latency > self.latency_target:
+                self._decrease()
+            else:
+                self.limit = min(self.max_limit, self.limit + 1.0 / self.limit)
+            self._condition.notify_all()
+
+    def _on_throttle(self) -> None:
+        with self._condition:
+            self.throttled += 1
+            self._decrease()
+
+    def _pause(self, retry_after: float) -> None:
+        # Every caller, this one included, waits it out in _acquire_slot
+        with self._condition:
+            self._paused_until = max(self._paused_until, self._clock() + retry_after)
+
+    def backoff(self, attempt: int) -> float:
+        """Full-jitter exponential backoff before retry number `attempt` (0-based)."""
+        return self._random() * min(self.max_delay, self.base_delay * 2 ** attempt)
+
+    def call(self, function, *args, **kwargs):
+        """Call `function(*args, **kwargs)` under the governor, retrying as configured."""
+        for attempt in range(self.max_retries + 1):
+            self._acquire_slot()
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire()
+            start = self._clock()
+            try:
+                result = function(*args, **kwargs)
+            except Exception as e:
+                self._release_slot()
+                verdict = self._classify(e)
+                if verdict is None or attempt == self.max_retries:
+                    raise
+                throttled, retry_after = verdict
+                if throttled:
+                    self._on_throttle()
+                with self._condition:
+                    self.retries += 1
+                # The server's Retry-After, whatever the status, pauses every
+                # caller; backoff only applies without one
+                if retry_after is not None:
+                    self._pause(retry_after)
+                else:
+                    self._sleep(self.backoff(attempt))
+                continue
+            self._release_slot()
+            self._on_success(self._clock() - start)
+            return result
+
+
+def make_governor(max_workers: int = 1, requests_per_second: float = None) -> RequestGovernor:
+    """
+    RequestGovernor for up to `max_workers` concurrent calls, starting at
+    four or fewer, with the rate capped at `requests_per_second` when set.
+    """
+    return RequestGovernor(
+        initial_limit=min(4, max_workers),
+        max_limit=max_workers,
+        rate_limiter=TokenBucket(requests_per_second) if requests_per_second else None,
+    )
+
+
+def count_requests(governor: RequestGovernor) -> None:
+    """Add a governor's call, throttle and retry counts to the running span."""
+    count('api_calls', governor.calls)
+    count('throttled', governor.throttled)
+    count('retries', governor.retries)
@@ -0,0 +1,121 @@
+import concurrent.futures
+import multiprocessing
+import os
+import tempfile
+from typing import Callable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Memory-mapped files live in RAM when a tmpfs is available
+SHARED_DIR = '/dev/shm' if os.path.isdir('/dev/shm') else None
+
+# Shards per worker, so uneven tickers still balance across the pool
+SHARDS_PER_WORKER = 4
+
+
+def shard_bounds(starts: np.ndarray, stops: np.ndarray, n_shards: int) -> List[Tuple[int, int]]:
+    """
+    Split consecutive groups into at most `n_shards` runs of roughly equal row
+    count. Returns (first group, last group + 1) pairs.
+    """
+    n_groups = len(starts)
+    if n_groups == 0:
+        return []
+    rows = np.cumsum(stops - starts)
+    targets = rows[-1] * np.arange(1, n_shards) / n_shards
+    cuts = np.unique(np.concatenate(([0], np.searchsorted(rows, targets, side='right'), [n_groups])))
+    return [(int(a), int(b)) for a, b in zip(cuts[:-1], cuts[1:]) if b > a]
+
+
+def _apply(kernel, values, outputs, starts, stops, args) -> None:
+    for start, stop in zip(starts, stops):
+        result = kernel(values[start:stop], *args)
+        if not isinstance(result, tuple):
+            result = (result,)
+        for out, part in zip(outputs, result):
+            out[..., start:stop] = part
+
+
+def _run_shard(kernel, values_path, n, output_specs, starts, stops, args) -> None:
+    values = np.memmap(values_path, dtype=np.float64, mode='r', shape=(n,))
+    outputs = [np.memmap(path, dtype=np.float64, mode='r+', shape=shape) for path, shape in output_specs]
+    _apply(kernel, values, outputs, starts, stops, args)
+    for out in outputs:
+        out.flush()
+
+
+def run_grouped(kernel: Callable, values: np.ndarray, starts: np.ndarray, stops: np.ndarray,
+                output_shapes: Sequence[Tuple[int, ...]], args: tuple = (),
+                max_workers: int = 1, start_method: str = 'spawn',
+                out: Optional[Sequence[np.ndarray]] = None) -> List[np.ndarray]:
+    """
+    Apply a per-group kernel to every contiguous group of `values`.
+
+    `kernel(values[start:stop], *args)` returns one array, or a tuple of
+    arrays, whose last axis runs over the group's rows; `output_shapes` gives
+    their leading dimensions. Results are written into preallocated
+    float64 outputs of shape leading + (len(values),), NaN outside groups.
+    `out` may give those outputs instead, e.g. views into a caller's block of
+    another float dtype; in-process the kernel results are written straight
+    into them.
+
+    With `max_workers` > 1 the groups are split into row-balanced shards and
+    run in a process pool. Prices and outputs are shared with the workers
+    through memory-mapped files rather than pickled, and each worker writes
+    its shard in place; `out` is filled from them once at the end. The
+    kernel must be a module-level function. Every group runs the same kernel
+    on the same data as in-process, so results are identical.
+    """
+    values = np.ascontiguousarray(values, dtype=np.float64)
+    n = len(values)
+    shapes = [tuple(shape) + (n,) for shape in output_shapes]
+
+    if out is not None:
+        if [o.shape for o in out] != shapes:
+            raise ValueError(f"out must have shapes {shapes}")
+        for o in out:
+            o[...] = np.nan
+
+    if max_workers <= 1 or len(starts) <= 1:
+        outputs = list(out) if out is not None else [np.full(shape, np.nan) for shape in shapes]
+        _apply(kernel, values, outputs, starts, stops, args)
+        return outputs
+
+    shards = shard_bounds(starts, stops, max_workers * SHARDS_PER_WORKER)
+    with tempfile.TemporaryDirectory(dir=SHARED_DIR) as tmp:
+        values_path = os.path.join(tmp, 'values.f8')
+        shared_values = np.memmap(values_path, dtype=np.float64, mode='w+', shape=(n,))
+        shared_values[:] = values
+        shared_values.flush()
+        del shared_values
+
+        output_specs = []
+        for k, shape in enumerate(shapes):
+            path = os.path.join(tmp, f'output{k}.f8')
+            shared = np.memmap(path, dtype=np.float64, mode='w+', shape=shape)
+            shared[:] = np.nan
+            shared.flush()
+            del shared
+            output_specs.append((path, shape))
+
+        context = multiprocessing.get_context(start_method)
+        with concurrent.futures.ProcessPoolExecutor(max_workers=max_workers, mp_context=context) as executor:
+            futures = [
+                executor.submit(
+                    _run_shard, kernel, values_path, n, output_specs,
+                    starts[first:last], stops[first:last], args,
+                )
+                for first, last in shards
+            ]
+            for future in futures:
+                future.result()
+
+        # Copy out of the mapped files before they are removed
+        if out is not None:
+            for o, (path, shape) in zip(out, output_specs):
+                o[...] = np.memmap(path, dtype=np.float64, mode='r', shape=shape)
+            return list(out)
+        return [
+            np.array(np.memmap(path, dtype=np.float64, mode='r', shape=shape))
+            for path, shape in output_specs
+        ]